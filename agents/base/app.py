@@ -7,15 +7,15 @@ and exposes them as simple HTTP endpoints.
 
 import os
 import json
+import asyncio
 import yaml
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from datetime import datetime, timezone
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import JSONResponse, PlainTextResponse
-from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 import httpx
 import uvicorn
@@ -30,6 +30,11 @@ OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://ollama:11434")
 MODEL_NAME = os.getenv("MODEL_NAME", os.getenv("DEFAULT_MODEL", "llama3.2"))
 TEMPERATURE = float(os.getenv("TEMPERATURE", os.getenv("DEFAULT_TEMPERATURE", "0.7")))
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", os.getenv("DEFAULT_MAX_TOKENS", "4096")))
+# Fail fast when Ollama doesn't accept the connection; failed connects are retried
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5.0"))
+OLLAMA_CONNECT_RETRIES = int(os.getenv("OLLAMA_CONNECT_RETRIES", "2"))
+# Upper bound on inputs accepted by a single /process/raw/batch call
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "16"))
 
 # Support for mounted runtime directory (Unified Standalone Architecture)
 # If AGENT_DATA_DIR is set, look for files there. Otherwise default to /app.
@@ -84,6 +89,20 @@ class AgentRequest(BaseModel):
     }
 
 
+class BatchRequest(BaseModel):
+    """Request model for processing several inputs in one call"""
+    inputs: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Input texts to process, each handled like a /process/raw request"
+    )
+    options: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Model options applied to every input"
+    )
+
+
 class AgentResponse(BaseModel):
     """Response model for agent invocation"""
     agent: str = Field(..., description="Name of the agent that processed the request")
@@ -159,6 +178,21 @@ class RawResponse(BaseModel):
     }
 
 
+class BatchItemResponse(BaseModel):
+    """Result for one input of a batch: its clean output, or the error it failed with"""
+    agent: str = Field(..., description="Name of the agent")
+    output: Optional[str] = Field(None, description="Extracted clean output (code block content)")
+    format: Optional[str] = Field(None, description="Detected format (yaml, json, text, etc.)")
+    timestamp: Optional[str] = Field(None, description="ISO 8601 timestamp")
+    error: Optional[str] = Field(None, description="Why this input failed (other inputs are unaffected)")
+
+
+class BatchResponse(BaseModel):
+    """Batch output response model"""
+    agent: str = Field(..., description="Name of the agent")
+    outputs: list[BatchItemResponse] = Field(..., description="One result per input, in input order")
+
+
 # ============================================================================
 # Agent Configuration
 # ============================================================================
@@ -212,7 +246,10 @@ class OllamaClient:
     def __init__(self, host: str, model: str):
         self.host = host.rstrip("/")
         self.model = model
-        self.client = httpx.AsyncClient(timeout=300.0)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(300.0, connect=OLLAMA_CONNECT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=OLLAMA_CONNECT_RETRIES)
+        )
 
     async def generate(
         self,
@@ -252,6 +289,47 @@ class OllamaClient:
                 detail=f"Ollama API error: {str(e)}"
             )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response from Ollama, yielding text fragments as they are produced.
+        Raises HTTPException if Ollama reports an error or the stream ends before `done`.
+        """
+
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "system": system,
+            "stream": True,
+            "options": options or {}
+        }
+
+        async with self.client.stream("POST", f"{self.host}/api/generate", json=payload) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line; failures arrive as an {"error": ...} line
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Ollama API error: {chunk['error']}"
+                    )
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    return
+
+        raise HTTPException(
+            status_code=500,
+            detail="Ollama API error: stream ended before the response was complete"
+        )
+
     async def health_check(self) -> bool:
         """Check if Ollama is healthy"""
         try:
@@ -358,7 +436,7 @@ class ContextMemory:
     def save_interaction(self, request: str, response: str, metadata: Dict = None):
         """Save an interaction to context memory"""
         timestamp = datetime.now().isoformat()
-        filename = f"interaction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"interaction_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json"
 
         data = {
             "timestamp": timestamp,
@@ -377,7 +455,7 @@ class ContextMemory:
 
         context = []
         for filepath in files[:limit]:
-            with open(filepath, "r") as f:
+            with open(filepath, "rb") as f:
                 context.append(json.load(f))
 
         return context
@@ -406,6 +484,8 @@ This agent is powered by Ollama using the **{MODEL_NAME}** model.
 
 ### Endpoints
 - **POST /process** - Main agent processing endpoint
+- **POST /process/raw/batch** - Process several inputs in one call
+- **POST /process/stream** - Stream output while it is generated
 - **GET /health** - Health check and status
 - **GET /info** - Agent information and capabilities
 - **GET /context** - View interaction history
@@ -480,6 +560,12 @@ async def health_check():
     }
 
 
+@app.head("/health", include_in_schema=False)
+async def health_probe():
+    """Cheap liveness probe - answers without contacting Ollama"""
+    return Response(status_code=200)
+
+
 @app.get(
     "/info",
     response_model=InfoResponse,
@@ -614,16 +700,19 @@ async def process_request(request: AgentRequest):
 )
 async def process_raw(request: AgentRequest):
     """Process input and return clean, extracted output"""
-
-    # Get model options
     options = agent_config.get_model_options(request.options)
+    return await _process_raw_input(request.input, options, request.stream)
+
+
+async def _process_raw_input(input_text: str, options: Dict[str, Any], stream: bool = False) -> RawResponse:
+    """Run one input through the model and extract its clean output"""
 
     # Generate response from Ollama
     response_text = await ollama_client.generate(
-        prompt=request.input,
+        prompt=input_text,
         system=agent_config.system_prompt,
         options=options,
-        stream=request.stream
+        stream=stream
     )
 
     # Extract clean output
@@ -639,7 +728,7 @@ async def process_raw(request: AgentRequest):
 
     # Save to context memory
     context_memory.save_interaction(
-        request=request.input,
+        request=input_text,
         response=response_text,
         metadata={"model": MODEL_NAME, "options": options, "format": detected_format}
     )
@@ -653,6 +742,51 @@ async def process_raw(request: AgentRequest):
     )
 
 
+@app.post(
+    "/process/raw/batch",
+    response_model=BatchResponse,
+    tags=["agent"],
+    summary="Process Several Inputs",
+    description="""
+    Process several inputs in one call and return the clean output of each.
+
+    Each input is handled exactly like a **/process/raw** request; they are sent
+    to Ollama concurrently, so callers with many inputs (e.g. CI over a set of
+    compose files) pay one HTTP round trip instead of one per input.
+
+    **Example Request:**
+    ```json
+    {
+        "inputs": ["first compose file...", "second compose file..."],
+        "options": {"temperature": 0.3}
+    }
+    ```
+
+    Results are returned in the same order as `inputs`. An input that fails gets
+    an `error` instead of an `output`; the other inputs are still returned. At
+    most `MAX_BATCH_SIZE` (default 16) inputs are accepted per call.
+    """
+)
+async def process_raw_batch(request: BatchRequest):
+    """Process a batch of inputs and return clean outputs (or per-input errors) in input order"""
+    options = agent_config.get_model_options(request.options)
+    results = await asyncio.gather(*[
+        _process_raw_input(input_text, options) for input_text in request.inputs
+    ], return_exceptions=True)
+
+    outputs = []
+    for result in results:
+        if isinstance(result, HTTPException):
+            outputs.append(BatchItemResponse(agent=AGENT_NAME, error=str(result.detail)))
+        elif isinstance(result, Exception):
+            outputs.append(BatchItemResponse(agent=AGENT_NAME, error=f"{type(result).__name__}: {result}"))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            outputs.append(BatchItemResponse(**result.model_dump()))
+    return BatchResponse(agent=AGENT_NAME, outputs=outputs)
+
+
 @app.post(
     "/process/raw/text",
     response_class=PlainTextResponse,
@@ -703,6 +837,65 @@ async def process_raw_text(request: AgentRequest):
     return clean
 
 
+@app.post(
+    "/process/stream",
+    response_class=StreamingResponse,
+    tags=["agent"],
+    summary="Process and Stream Output",
+    description="""
+    Process input and stream the model output as plain text while it is generated.
+
+    Returns the same text as **/process**, but the first fragments arrive as soon
+    as the model produces them instead of after the whole reply is ready.
+
+    **Example Usage:**
+    ```bash
+    curl -N -X POST http://localhost:7001/process/stream \\
+      -H "Content-Type: application/json" \\
+      -d '{"input": "your content"}'
+    ```
+
+    The `{{TIMESTAMP}}` placeholder is not substituted in streamed output.
+    """
+)
+async def process_stream(request: AgentRequest):
+    """Stream the agent's output as it is generated"""
+
+    # Get model options
+    options = agent_config.get_model_options(request.options)
+
+    # Open the Ollama stream before answering so connection errors still map to an HTTP error
+    stream = ollama_client.generate_stream(
+        prompt=request.input,
+        system=agent_config.system_prompt,
+        options=options
+    )
+    try:
+        first = await anext(stream, "")
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ollama API error: {str(e)}"
+        )
+
+    async def body():
+        fragments = [first]
+        yield first
+        async for fragment in stream:
+            fragments.append(fragment)
+            yield fragment
+
+        # Save to context memory once the reply is complete (the stream raises
+        # instead of finishing when Ollama fails part-way)
+        context_memory.save_interaction(
+            request=request.input,
+            response="".join(fragments),
+            metadata={"model": MODEL_NAME, "options": options, "stream": True}
+        )
+
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
+
+
 @app.get(
     "/context",
     response_model=ContextResponse,
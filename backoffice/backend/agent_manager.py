@@ -5,11 +5,18 @@ Handles agent lifecycle management in a modular way.
 """
 
 import os
+import functools
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 from pydantic import BaseModel
 
+# Prefer the LibYAML-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
 
 class AgentDefinition(BaseModel):
     """Agent definition model"""
@@ -24,6 +31,13 @@ class AgentDefinition(BaseModel):
     system_prompt: str
 
 
+@functools.lru_cache(maxsize=256)
+def _load_definition_file(filepath: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse an agent definition; cached per (path, mtime, size) so edits invalidate it"""
+    with open(filepath, "rb") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 class AgentManager:
     """
     Manages agent definitions in a modular way.
@@ -58,7 +72,7 @@ class AgentManager:
 
         filepath = self.definitions_dir / f"{agent.name}.yml"
         with open(filepath, "w") as f:
-            yaml.dump(definition, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(definition, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
 
         return str(filepath)
 
@@ -67,8 +81,8 @@ class AgentManager:
         definitions = []
         for filepath in self.definitions_dir.glob("*.yml"):
             try:
-                with open(filepath, "r") as f:
-                    data = yaml.safe_load(f)
+                with open(filepath, "rb") as f:
+                    data = yaml.load(f, Loader=YamlLoader)
                     definitions.append({
                         "name": data["agent"]["name"],
                         "description": data["agent"].get("description", ""),
@@ -84,14 +98,24 @@ class AgentManager:
                 })
         return definitions
 
-    def get_agent_definition(self, name: str) -> Dict[str, Any]:
-        """Get a specific agent definition"""
+    def get_agent_definition(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a specific agent definition (cached until the file changes)"""
         filepath = self.definitions_dir / f"{name}.yml"
-        if not filepath.exists():
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
             return None
 
-        with open(filepath, "r") as f:
-            return yaml.safe_load(f)
+        return _load_definition_file(str(filepath), stat.st_mtime_ns, stat.st_size)
+
+    def bulk_get(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several agent definitions at once, skipping names without a definition"""
+        definitions = {}
+        for name in names:
+            definition = self.get_agent_definition(name)
+            if definition:
+                definitions[name] = definition
+        return definitions
 
     def update_agent_definition(self, agent: AgentDefinition) -> str:
         """
@@ -153,7 +177,7 @@ agent:
   version: 1.0.0
 
 capabilities:
-{yaml.dump(capabilities, default_flow_style=False, indent=2)}
+{yaml.dump(capabilities, Dumper=YamlDumper, default_flow_style=False, indent=2)}
 
 options:
   temperature: {temperature}
@@ -6,24 +6,56 @@ Provides REST API for managing agents and executing workflows.
 
 import os
 import re
+import gzip
+import hashlib
+import mimetypes
+import time
+import shutil
+import traceback
+import zipfile
+import asyncio
+import logging
 import yaml
-from typing import Dict, Any, List, Optional
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple, Type
 from pathlib import Path
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from pydantic import BaseModel, Field
 import uvicorn
 import httpx
+import orjson
 
-from orchestrator import WorkflowOrchestrator, WorkflowManager, Workflow
+from orchestrator import WorkflowOrchestrator, WorkflowManager, Workflow, WorkflowExecution, ExecutionStore
 from agent_manager import AgentManager, AgentDefinition
 from deployment_manager import DeploymentManager
 from plugin_manager import PluginRegistry, PluginValidator, PluginManifest
+from request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+# Prefer the LibYAML-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+logger = logging.getLogger(__name__)
+
+
+def _yaml_load(content):
+    """Parse YAML from a string, bytes or file object"""
+    return yaml.load(content, Loader=YamlLoader)
+
+
+def _yaml_dump(data: Any, stream=None):
+    """Serialize to block-style YAML, keeping key order"""
+    return yaml.dump(data, stream, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
 
 
 # ============================================================================
@@ -51,6 +83,30 @@ PROJECT_ROOT = Path(os.getenv("PROJECT_ROOT", DEFAULT_PROJECT_ROOT))
 plugin_registry = PluginRegistry(PROJECT_ROOT)
 
 
+# Meta-prompt for generating agent prompts (filled via str.format_map)
+META_PROMPT_TEMPLATE = """You are an expert at writing system prompts for AI agents.
+
+Create a comprehensive, well-structured system prompt for an AI agent with these requirements:
+
+**Purpose:** {purpose}
+{expertise_line}
+{input_format_line}
+{output_format_line}
+
+Create a system prompt that includes:
+1. A clear role definition
+2. The agent's expertise and capabilities
+3. Step-by-step task instructions
+4. Guidelines and best practices
+5. Output format specification
+6. Any constraints or limitations
+
+Format the prompt professionally with markdown headers (##) and bullet points.
+Make it clear, actionable, and comprehensive.
+
+Return ONLY the system prompt itself, ready to use. Do not include explanations or meta-commentary."""
+
+
 # ============================================================================
 # Data Models
 # ============================================================================
@@ -66,7 +122,7 @@ class WorkflowCreateRequest(BaseModel):
     description: str = Field("", description="Workflow description")
     version: str = Field("1.0.0", description="Workflow version")
     steps: List[Dict[str, Any]] = Field(..., description="Workflow steps")
-    metadata: Optional[Dict[str, Any]] = Field(None, description="Optional metadata")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Optional metadata")
 
 
 class AgentTestRequest(BaseModel):
@@ -101,6 +157,19 @@ class AgentUpdateRequest(BaseModel):
     system_prompt: str = Field(..., description="System prompt for the agent")
 
 
+class BatchSubRequest(BaseModel):
+    """A single API call inside a batch request"""
+    id: Optional[str] = Field(None, description="Client-chosen ID echoed back in the response")
+    method: str = Field("GET", description="HTTP method")
+    path: str = Field(..., description="API path, e.g. /api/workflows/my-workflow")
+    body: Optional[Any] = Field(None, description="Optional JSON body")
+
+
+class BatchRequest(BaseModel):
+    """Request to run several API calls in one round-trip"""
+    requests: List[BatchSubRequest] = Field(..., description="API calls to execute", max_length=50)
+
+
 class PromptGenerateRequest(BaseModel):
 
     """Request to generate an agent prompt using AI"""
@@ -113,6 +182,14 @@ class PromptGenerateRequest(BaseModel):
 # ============================================================================
 # FastAPI Application
 # ============================================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan (see startup_event/shutdown_event below)"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
+
 app = FastAPI(
     title="Ollama Agents Backoffice",
     description="""
@@ -150,6 +227,8 @@ steps:
 ```
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     openapi_tags=[
         {"name": "agents", "description": "Agent discovery and management"},
         {"name": "workflows", "description": "Workflow management and execution"},
@@ -166,6 +245,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms + X-Request-ID on every response (see GET /metrics)
+request_metrics = RequestMetrics()
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Initialize components
 workflow_manager = WorkflowManager(WORKFLOWS_DIR, WORKFLOWS_EXAMPLES_DIR)
 agent_manager = AgentManager(AGENT_DEFINITIONS_DIR)
@@ -174,8 +257,72 @@ deployment_manager = DeploymentManager(PROJECT_ROOT)
 # Orchestrator will be initialized after plugin discovery
 orchestrator = None
 
-# Store for workflow executions (in-memory for now)
-executions = {}
+# Set once startup plugin discovery has finished and the orchestrator exists
+plugins_ready = asyncio.Event()
+# Set when the orchestrator couldn't be built at startup
+plugin_init_error: Optional[str] = None
+
+
+async def require_plugins_ready():
+    """Dependency for endpoints that need the orchestrator"""
+    if not plugins_ready.is_set():
+        raise HTTPException(status_code=503, detail="Plugin discovery in progress, try again shortly")
+    if plugin_init_error:
+        raise HTTPException(status_code=500, detail=f"Orchestrator initialization failed: {plugin_init_error}")
+
+
+def json_body(model: Type[BaseModel]):
+    """
+    Dependency that validates the raw request body straight into `model`.
+
+    pydantic-core parses and validates the JSON bytes in one pass, skipping
+    the intermediate json.loads() dict that FastAPI builds for body params.
+
+    Args:
+        model: Pydantic model describing the body
+
+    Returns:
+        Dependency callable returning a `model` instance
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+            ])
+    return parse
+
+
+def json_body_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints using json_body(), so /docs still shows the model"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+
+# Store for workflow executions (in-memory, bounded to the most recent MAX_EXECUTIONS)
+executions = ExecutionStore(max_size=int(os.getenv("MAX_EXECUTIONS", "500")))
+
+# Serialized GET /api/workflows/{name} bodies: name -> ((mtime_ns, size), json bytes),
+# least recently used first; bounded so workflows removed outside the API don't linger
+WORKFLOW_JSON_CACHE_SIZE = 128
+_workflow_json_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Workflows with at least this many steps are streamed rather than cached as one body
+WORKFLOW_STREAM_MIN_STEPS = int(os.getenv("WORKFLOW_STREAM_MIN_STEPS", "500"))
+
+# Serialized GET /api/workflows body: (listing signature, json bytes)
+_workflow_index_cache: tuple = ((), b"")
+
+# Background tasks for executions still in flight (execution_id -> task)
+running_tasks: Dict[str, asyncio.Task] = {}
+
+# Caps how many executions run at once; the rest stay "pending" until a slot frees up
+execution_slots = asyncio.Semaphore(int(os.getenv("MAX_RUNNING_EXECUTIONS", "32")))
 
 
 # ============================================================================
@@ -183,10 +330,10 @@ executions = {}
 # ============================================================================
 
 @app.get("/", include_in_schema=False)
-async def root():
+async def root(request: Request):
     """Redirect to frontend"""
-    if FRONTEND_DIR.exists() and (FRONTEND_DIR / "index.html").exists():
-        return FileResponse(FRONTEND_DIR / "index.html")
+    if "index.html" in static_files:
+        return _static_response(request, static_files["index.html"])
     return {"message": "Ollama Agents Backoffice API", "docs": "/docs"}
 
 
@@ -203,6 +350,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["health"], summary="Request metrics (Prometheus format)", response_class=PlainTextResponse)
+async def metrics():
+    """Per-route request latency histograms in Prometheus text exposition format"""
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/config", tags=["system"], summary="Get system configuration")
 async def get_config():
     """
@@ -238,31 +391,32 @@ async def get_available_models(ollama_host: Optional[str] = None):
         if not ollama_host.startswith(("http://", "https://")):
             ollama_host = f"http://{ollama_host}"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{ollama_host}/api/tags")
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract and format model information
-            models = []
-            for model in data.get("models", []):
-                models.append({
-                    "name": model.get("name", "").replace(":latest", ""),
-                    "full_name": model.get("name", ""),
-                    "size": model.get("size", 0),
-                    "size_gb": round(model.get("size", 0) / (1024**3), 2),
-                    "modified_at": model.get("modified_at", ""),
-                    "family": model.get("details", {}).get("family", ""),
-                    "parameter_size": model.get("details", {}).get("parameter_size", ""),
-                    "quantization": model.get("details", {}).get("quantization_level", "")
-                })
+        # Shared client: keeps the connection to Ollama open between calls
+        client = app.state.http
+        response = await client.get(f"{ollama_host}/api/tags", timeout=10.0)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        # Extract and format model information
+        models = []
+        for model in data.get("models", []):
+            models.append({
+                "name": model.get("name", "").replace(":latest", ""),
+                "full_name": model.get("name", ""),
+                "size": model.get("size", 0),
+                "size_gb": round(model.get("size", 0) / (1024**3), 2),
+                "modified_at": model.get("modified_at", ""),
+                "family": model.get("details", {}).get("family", ""),
+                "parameter_size": model.get("details", {}).get("parameter_size", ""),
+                "quantization": model.get("details", {}).get("quantization_level", "")
+            })
 
-            return {
-                "status": "success",
-                "models": models,
-                "count": len(models),
-                "ollama_host": ollama_host
-            }
+        return {
+            "status": "success",
+            "models": models,
+            "count": len(models),
+            "ollama_host": ollama_host
+        }
 
     except httpx.HTTPError as e:
         raise HTTPException(
@@ -280,19 +434,25 @@ async def get_available_models(ollama_host: Optional[str] = None):
 # Agent Endpoints
 # ============================================================================
 
-async def discover_runtime_agents() -> Dict[str, Any]:
+async def _discover_docker_agents() -> Dict[str, Any]:
     """
-    Helper to discover all running agents from Docker and static definitions.
+    Discover agent containers from Docker and probe the running ones.
     Returns a dictionary of agent info.
     """
-    # Get running agents from Docker
     discovered_agents = {}
 
     if deployment_manager.docker_client:
         try:
             # Use low-level API to avoid crashes from "ghost" containers
             # client.containers.list() tries to inspect every container and crashes if one is dead/missing
-            containers = deployment_manager.docker_client.api.containers(all=True)
+            containers = await asyncio.to_thread(deployment_manager.docker_client.api.containers, all=True)
+
+            # Drop cached /info payloads for containers that are gone or no longer running
+            info_cache = app.state.agent_info_cache
+            running_ids = {c.get('Id') for c in containers if c.get('State') == 'running'}
+            for cached_id in list(info_cache):
+                if cached_id not in running_ids:
+                    del info_cache[cached_id]
             
             for c_dict in containers:
                 try:
@@ -320,16 +480,27 @@ async def discover_runtime_agents() -> Dict[str, Any]:
                     }
 
                     if status == "running":
-                        # Try to get agent info via health/info endpoint
+                        # Cheap HEAD /health probe; full /info is only fetched on first sight
+                        # of a container and cached until it stops or is recreated
                         try:
-                            async with httpx.AsyncClient(timeout=2.0) as client:
-                                response = await client.get(f"{url}/info")
+                            client = app.state.http
+                            response = await client.head(f"{url}/health", timeout=2.0)
+                            if response.status_code == 405:
+                                # Older agent images only answer GET - fall back to /info
+                                info_cache.pop(c_id, None)
+                                response = await client.get(f"{url}/info", timeout=2.0)
                                 if response.status_code == 200:
-                                    info = response.json()
-                                    agent_info.update(info)
-                                    agent_info["status"] = "healthy"
-                                else:
-                                    agent_info["status"] = "unhealthy"
+                                    info_cache[c_id] = orjson.loads(response.content)
+
+                            if response.status_code == 200:
+                                if c_id not in info_cache:
+                                    info_response = await client.get(f"{url}/info", timeout=2.0)
+                                    if info_response.status_code == 200:
+                                        info_cache[c_id] = orjson.loads(info_response.content)
+                                agent_info.update(info_cache.get(c_id, {}))
+                                agent_info["status"] = "healthy"
+                            else:
+                                agent_info["status"] = "unhealthy"
                         except Exception:
                             # Container is running but not responsive yet
                             agent_info["status"] = "starting"
@@ -352,10 +523,38 @@ async def discover_runtime_agents() -> Dict[str, Any]:
         except Exception as e:
             print(f"Error discovering agents: {e}")
 
+    return discovered_agents
+
+
+async def _discover_registry_agents(force: bool = False) -> Dict[str, Any]:
+    """Probe agents known to the orchestrator registry"""
+    return await orchestrator.discover_agents(force=force)
+
+
+async def discover_runtime_agents(force: bool = False) -> Dict[str, Any]:
+    """
+    Helper to discover all running agents from Docker and static definitions.
+    Returns a dictionary of agent info.
+
+    Args:
+        force: Re-probe registry agents instead of reusing a recent result
+    """
+    # Docker scan and registry probes are independent - run them concurrently
+    discovered_agents, original_agents = await asyncio.gather(
+        _discover_docker_agents(),
+        _discover_registry_agents(force),
+        return_exceptions=True
+    )
+
+    if isinstance(discovered_agents, Exception):
+        print(f"Error discovering agents: {discovered_agents}")
+        discovered_agents = {}
+
     # Merge with original discovery (for backwards compatibility)
     # Only add from original if not already discovered
-    try:
-        original_agents = await orchestrator.discover_agents()
+    if isinstance(original_agents, Exception):
+        print(f"Error in original discovery: {original_agents}")
+    else:
         for name, info in original_agents.items():
             if name not in discovered_agents:
                 # Get source from plugin registry
@@ -365,17 +564,17 @@ async def discover_runtime_agents() -> Dict[str, Any]:
                 else:
                     info["source"] = "runtime"
                 discovered_agents[name] = info
-    except Exception as e:
-        print(f"Error in original discovery: {e}")
 
     return discovered_agents
 
 
-@app.get("/api/agents", tags=["agents"], summary="List all agents")
-async def list_agents():
+@app.get("/api/agents", tags=["agents"], summary="List all agents", dependencies=[Depends(require_plugins_ready)])
+async def list_agents(refresh: bool = False):
     """
     Discover and list all available agents.
 
+    Registry probes are cached for a few seconds; pass `?refresh=true` to force new ones.
+
     Returns information about each agent including:
     - URL
     - Health status
@@ -387,16 +586,15 @@ async def list_agents():
     1. Docker containers with prefix "agent-"
     2. Agent definitions waiting to be deployed
     """
-    discovered_agents = await discover_runtime_agents()
+    discovered_agents = await discover_runtime_agents(force=refresh)
     
     # Sync with orchestrator registry so workflows can use these agents
     for name, info in discovered_agents.items():
         if info.get("url"):
             orchestrator.agent_registry[name] = info["url"]
 
-    print(f"Returning {len(discovered_agents)} agents: {list(discovered_agents.keys())}")
-    # import json
-    # print(json.dumps(discovered_agents, indent=2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Returning %d agents: %s", len(discovered_agents), list(discovered_agents))
 
     return {
         "count": len(discovered_agents),
@@ -416,7 +614,21 @@ async def list_agent_definitions():
     }
 
 
-@app.get("/api/agents/{agent_name}", tags=["agents"], summary="Get agent details")
+@app.get("/api/agents/status", tags=["agents"], summary="Get deployment status of all agents")
+async def list_agent_deployment_status():
+    """
+    Get the deployment status of every agent with runtime files or a compose file.
+    Same fields as /api/agents/{agent_name}/status, built from one directory scan
+    and one container listing.
+    """
+    statuses = await asyncio.to_thread(deployment_manager.list_agent_status)
+    return {
+        "count": len(statuses),
+        "agents": statuses
+    }
+
+
+@app.get("/api/agents/{agent_name}", tags=["agents"], summary="Get agent details", dependencies=[Depends(require_plugins_ready)])
 async def get_agent_details(agent_name: str):
     """Get detailed information about a specific agent"""
     plugin = plugin_registry.get(agent_name)
@@ -435,7 +647,7 @@ async def get_agent_details(agent_name: str):
     return agent_info
 
 
-@app.post("/api/agents/test", tags=["agents"], summary="Test an agent")
+@app.post("/api/agents/test", tags=["agents"], summary="Test an agent", dependencies=[Depends(require_plugins_ready)])
 async def test_agent(request: AgentTestRequest):
     """
     Test an agent with sample input.
@@ -674,33 +886,18 @@ async def generate_agent_prompt(request: PromptGenerateRequest):
 
     This uses Ollama directly to help users write better agent prompts.
     """
-    # Meta-prompt for generating agent prompts
-    meta_prompt = f"""You are an expert at writing system prompts for AI agents.
-
-Create a comprehensive, well-structured system prompt for an AI agent with these requirements:
-
-**Purpose:** {request.agent_purpose}
-{f"**Expertise Domain:** {request.agent_expertise}" if request.agent_expertise else ""}
-{f"**Input Format:** {request.input_format}" if request.input_format else ""}
-{f"**Output Format:** {request.output_format}" if request.output_format else ""}
-
-Create a system prompt that includes:
-1. A clear role definition
-2. The agent's expertise and capabilities
-3. Step-by-step task instructions
-4. Guidelines and best practices
-5. Output format specification
-6. Any constraints or limitations
-
-Format the prompt professionally with markdown headers (##) and bullet points.
-Make it clear, actionable, and comprehensive.
-
-Return ONLY the system prompt itself, ready to use. Do not include explanations or meta-commentary."""
+    # Optional lines collapse to empty strings when the field is not provided
+    fields = defaultdict(
+        str,
+        purpose=request.agent_purpose,
+        expertise_line=f"**Expertise Domain:** {request.agent_expertise}" if request.agent_expertise else "",
+        input_format_line=f"**Input Format:** {request.input_format}" if request.input_format else "",
+        output_format_line=f"**Output Format:** {request.output_format}" if request.output_format else "",
+    )
+    meta_prompt = META_PROMPT_TEMPLATE.format_map(fields)
 
     try:
         # Call Ollama directly
-        import httpx
-        import traceback
         ollama_host = os.getenv("OLLAMA_HOST", "http://ollama:11434")
 
         # Use configurable model with fallback options
@@ -728,54 +925,55 @@ Return ONLY the system prompt itself, ready to use. Do not include explanations
         print(f"Using timeout of {timeout}s for prompt generation ({'GPU' if is_gpu else 'CPU'} mode)")
 
         last_error = None
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            # Try each model variation until one works
-            for model in model_variations:
-                if not model:  # Skip None values
-                    continue
+        client = app.state.http
+        # Try each model variation until one works
+        for model in model_variations:
+            if not model:  # Skip None values
+                continue
 
-                try:
-                    print(f"Attempting prompt generation with model: {model}")
-                    response = await client.post(
-                        f"{ollama_host}/api/generate",
-                        json={
-                            "model": model,
-                            "prompt": meta_prompt,
-                            "stream": False,
-                            "options": {
-                                "temperature": 0.7,
-                                "num_predict": 2048
-                            }
+            try:
+                print(f"Attempting prompt generation with model: {model}")
+                response = await client.post(
+                    f"{ollama_host}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": meta_prompt,
+                        "stream": False,
+                        "options": {
+                            "temperature": 0.7,
+                            "num_predict": 2048
                         }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    generated_prompt = result.get("response", "")
-
-                    print(f"✓ Successfully generated prompt using model: {model}")
-                    return {
-                        "status": "success",
-                        "generated_prompt": generated_prompt.strip(),
-                        "message": f"Prompt generated successfully using {model}! Review and edit as needed.",
-                        "model_used": model
-                    }
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        print(f"Model '{model}' not found, trying next...")
-                        last_error = e
-                        continue  # Try next model
-                    else:
-                        raise  # Other HTTP errors should be raised
-                except Exception as e:
+                    },
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+                generated_prompt = result.get("response", "")
+
+                print(f"✓ Successfully generated prompt using model: {model}")
+                return {
+                    "status": "success",
+                    "generated_prompt": generated_prompt.strip(),
+                    "message": f"Prompt generated successfully using {model}! Review and edit as needed.",
+                    "model_used": model
+                }
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    print(f"Model '{model}' not found, trying next...")
                     last_error = e
                     continue  # Try next model
-
-            # If we get here, none of the models worked
-            raise Exception(
-                f"None of the attempted models are available on {ollama_host}. "
-                f"Tried: {', '.join([m for m in model_variations if m])}. "
-                f"Set PROMPT_MODEL env var to specify a different model, or install one of: llama3.2, llama3"
-            )
+                else:
+                    raise  # Other HTTP errors should be raised
+            except Exception as e:
+                last_error = e
+                continue  # Try next model
+
+        # If we get here, none of the models worked
+        raise Exception(
+            f"None of the attempted models are available on {ollama_host}. "
+            f"Tried: {', '.join([m for m in model_variations if m])}. "
+            f"Set PROMPT_MODEL env var to specify a different model, or install one of: llama3.2, llama3"
+        )
 
     except Exception as e:
         # Log the actual error for debugging
@@ -810,8 +1008,8 @@ async def deploy_agent(agent_name: str):
                 detail=f"Agent definition '{agent_name}' not found"
             )
 
-        # Deploy the agent
-        result = deployment_manager.deploy_agent(agent_name, definition)
+        # Deploy the agent (compose and Docker calls block, keep them off the event loop)
+        result = await asyncio.to_thread(deployment_manager.deploy_agent, agent_name, definition)
 
         if result["status"] == "success":
             return {
@@ -853,14 +1051,14 @@ async def get_agent_deployment_status(agent_name: str):
     - Container status
     - Health status
     """
-    status = deployment_manager.get_agent_status(agent_name)
+    status = await asyncio.to_thread(deployment_manager.get_agent_status, agent_name)
     return status
 
 
 @app.post("/api/agents/{agent_name}/restart", tags=["agents"], summary="Restart an agent")
 async def restart_agent_container(agent_name: str):
     """Restart an agent's container"""
-    result = deployment_manager.restart_agent(agent_name)
+    result = await asyncio.to_thread(deployment_manager.restart_agent, agent_name)
     if result["status"] == "error":
         raise HTTPException(status_code=500, detail=result["message"])
     return result
@@ -869,7 +1067,7 @@ async def restart_agent_container(agent_name: str):
 @app.post("/api/agents/{agent_name}/stop", tags=["agents"], summary="Stop an agent")
 async def stop_agent_container(agent_name: str):
     """Stop an agent's container"""
-    result = deployment_manager.stop_agent(agent_name)
+    result = await asyncio.to_thread(deployment_manager.stop_agent, agent_name)
     if result["status"] == "error":
         raise HTTPException(status_code=500, detail=result["message"])
     return result
@@ -878,7 +1076,7 @@ async def stop_agent_container(agent_name: str):
 @app.post("/api/agents/{agent_name}/start", tags=["agents"], summary="Start a stopped agent")
 async def start_agent_container(agent_name: str):
     """Start a stopped agent container using docker-compose"""
-    result = deployment_manager.start_agent(agent_name)
+    result = await asyncio.to_thread(deployment_manager.start_agent, agent_name)
     if result["status"] == "success":
         return result
     else:
@@ -901,7 +1099,7 @@ async def delete_agent_completely(agent_name: str, remove_files: bool = True):
     Warning: This is irreversible!
     """
     # Delete from deployment
-    result = deployment_manager.delete_agent(agent_name, remove_files)
+    result = await asyncio.to_thread(deployment_manager.delete_agent, agent_name, remove_files)
 
     # Also delete the agent definition
     agent_manager.delete_agent_definition(agent_name)
@@ -949,7 +1147,7 @@ async def list_plugins():
                 "id": plugin_id,
                 "url": data["url"],
                 "status": data.get("status", "unknown"),
-                "registered_at": data.get("registered_at"),
+                "registered_at": plugin_registry.registered_at_iso(data),
                 **data.get("manifest", {})
             }
             for plugin_id, data in plugins.items()
@@ -965,10 +1163,10 @@ async def get_plugin(plugin_id: str):
     if not plugin:
         raise HTTPException(status_code=404, detail=f"Plugin '{plugin_id}' not found")
 
-    return plugin
+    return {**plugin, "registered_at": plugin_registry.registered_at_iso(plugin)}
 
 
-@app.post("/api/plugins/discover", tags=["plugins"], summary="Re-discover plugins")
+@app.post("/api/plugins/discover", tags=["plugins"], summary="Re-discover plugins", dependencies=[Depends(require_plugins_ready)])
 async def rediscover_plugins():
     """
     Trigger plugin re-discovery.
@@ -978,7 +1176,7 @@ async def rediscover_plugins():
     global orchestrator
 
     # Re-discover plugins
-    plugin_count = plugin_registry.discover_all()
+    plugin_count = await _discover_plugins()
 
     # Reinitialize orchestrator with updated registry
     agent_registry_legacy = plugin_registry.to_legacy_registry()
@@ -1043,15 +1241,35 @@ async def list_workflows():
 
     Returns a list of workflows that can be executed.
     """
-    workflows = workflow_manager.list_workflows()
-    return {
-        "count": len(workflows),
-        "workflows": workflows
-    }
+    global _workflow_index_cache
+
+    # Only stat the files; the listing is rebuilt when one is added, removed or changed
+    signature = workflow_manager.get_listing_signature()
+    if _workflow_index_cache[0] != signature or not _workflow_index_cache[1]:
+        workflows = await asyncio.to_thread(workflow_manager.list_workflows)
+        _workflow_index_cache = (signature, orjson.dumps({
+            "count": len(workflows),
+            "workflows": workflows
+        }))
+
+    return Response(content=_workflow_index_cache[1], media_type="application/json")
 
 
-@app.post("/api/workflows/{workflow_name}/execute", tags=["workflows"], summary="Execute a workflow")
-async def execute_workflow(workflow_name: str, request: WorkflowExecuteRequest):
+async def _run_execution(execution: WorkflowExecution, workflow: Workflow, context: Optional[Dict[str, Any]]):
+    """Run a queued execution in the background, recording the outcome on the execution"""
+    try:
+        async with execution_slots:
+            await orchestrator.execute_workflow(workflow, execution.initial_input, context, execution)
+    except asyncio.CancelledError:
+        execution.cancel()
+    except Exception as e:
+        execution.status = "failed"
+        execution.error = f"Workflow execution error: {str(e)}"
+        execution.mark_finished()
+
+
+@app.post("/api/workflows/{workflow_name}/execute", tags=["workflows"], summary="Execute a workflow", dependencies=[Depends(require_plugins_ready)], openapi_extra=json_body_schema(WorkflowExecuteRequest))
+async def execute_workflow(workflow_name: str, request: WorkflowExecuteRequest = Depends(json_body(WorkflowExecuteRequest)), wait: bool = False):
     """
     Execute a specific workflow with the given input.
 
@@ -1060,6 +1278,7 @@ async def execute_workflow(workflow_name: str, request: WorkflowExecuteRequest):
 
     The workflow will be executed asynchronously and return immediately with
     an execution ID. Use the execution ID to check the status and results.
+    Pass `wait=true` to block until the execution finishes instead.
     """
     # Load workflow
     workflow = workflow_manager.load_workflow(workflow_name)
@@ -1069,73 +1288,118 @@ async def execute_workflow(workflow_name: str, request: WorkflowExecuteRequest):
             detail=f"Workflow '{workflow_name}' not found"
         )
 
-    # Execute workflow
-    try:
-        execution = await orchestrator.execute_workflow(
-            workflow=workflow,
-            initial_input=request.input,
-            context=request.context
-        )
+    # Register a pending execution and run it in the background
+    execution = WorkflowExecution(workflow, request.input)
+    executions.put(execution)
 
-        # Store execution
-        executions[execution.execution_id] = execution
+    task = asyncio.create_task(_run_execution(execution, workflow, request.context))
+    running_tasks[execution.execution_id] = task
+    task.add_done_callback(lambda _: running_tasks.pop(execution.execution_id, None))
 
-        return {
+    if wait:
+        await asyncio.shield(task)
+        return ORJSONResponse({
             "status": "executed",
             "execution_id": execution.execution_id,
             "result": execution.to_dict()
-        }
+        })
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Workflow execution failed: {str(e)}"
-        )
+    return ORJSONResponse(
+        status_code=202,
+        content={
+            "status": "accepted",
+            "execution_id": execution.execution_id,
+            "result": execution.to_dict()
+        }
+    )
 
 
 @app.get("/api/workflows/{workflow_name}", tags=["workflows"], summary="Get workflow details")
 async def get_workflow(workflow_name: str):
     """Get detailed information about a specific workflow"""
+    signature = workflow_manager.get_workflow_signature(workflow_name)
+    if not signature:
+        raise HTTPException(status_code=404, detail=f"Workflow '{workflow_name}' not found")
+
+    # Serve the pre-encoded body while the underlying file is unchanged
+    version = signature[1:]
+    cached = _workflow_json_cache.get(workflow_name)
+    if cached and cached[0] == version:
+        _workflow_json_cache.move_to_end(workflow_name)
+        return Response(content=cached[1], media_type="application/json")
+
     workflow = workflow_manager.load_workflow(workflow_name)
     if not workflow:
         raise HTTPException(status_code=404, detail=f"Workflow '{workflow_name}' not found")
 
-    return {
+    # Very large workflows are encoded step by step instead of buffering (and caching) the whole body
+    if len(workflow.steps) >= WORKFLOW_STREAM_MIN_STEPS:
+        return StreamingResponse(_stream_workflow_json(workflow), media_type="application/json")
+
+    content = orjson.dumps({
         "name": workflow.name,
         "description": workflow.description,
         "version": workflow.version,
-        "steps": [
-            {
-                "name": step.name,
-                "agent": step.agent,
-                "input_source": step.input_source,
-                "timeout": step.timeout,
-                "retry": step.retry,
-                "on_error": step.on_error
-            }
-            for step in workflow.steps
-        ],
+        "steps": [_step_to_dict(step) for step in workflow.steps],
         "metadata": workflow.metadata
+    })
+    _workflow_json_cache[workflow_name] = (version, content)
+    _workflow_json_cache.move_to_end(workflow_name)
+    while len(_workflow_json_cache) > WORKFLOW_JSON_CACHE_SIZE:
+        _workflow_json_cache.popitem(last=False)
+
+    return Response(content=content, media_type="application/json")
+
+
+def _step_to_dict(step) -> Dict[str, Any]:
+    """Public fields of a workflow step"""
+    return {
+        "name": step.name,
+        "agent": step.agent,
+        "input_source": step.input_source,
+        "timeout": step.timeout,
+        "retry": step.retry,
+        "on_error": step.on_error,
+        "depends_on": step.depends_on
     }
 
 
-@app.post("/api/workflows", tags=["workflows"], summary="Create a new workflow")
-async def create_workflow(request: WorkflowCreateRequest):
-    """
-    Create a new workflow definition.
+async def _stream_workflow_json(workflow: Workflow):
+    """Encode a workflow as JSON one step at a time, yielding to the event loop between chunks"""
+    yield b'{"name":' + orjson.dumps(workflow.name)
+    yield b',"description":' + orjson.dumps(workflow.description)
+    yield b',"version":' + orjson.dumps(workflow.version)
+    yield b',"steps":['
+    for i, step in enumerate(workflow.steps):
+        chunk = orjson.dumps(_step_to_dict(step))
+        yield b"," + chunk if i else chunk
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    yield b'],"metadata":' + orjson.dumps(workflow.metadata) + b"}"
 
-    The workflow will be saved as a YAML file and can be executed immediately.
-    """
-    workflow_config = {
+
+def _workflow_config(request: WorkflowCreateRequest) -> Dict[str, Any]:
+    """Build the workflow YAML structure from a create/update request"""
+    return {
         "name": request.name,
         "description": request.description,
         "version": request.version,
         "steps": request.steps,
-        "metadata": request.metadata or {}
+        "metadata": request.metadata
     }
 
+
+@app.post("/api/workflows", tags=["workflows"], summary="Create a new workflow", openapi_extra=json_body_schema(WorkflowCreateRequest))
+async def create_workflow(request: WorkflowCreateRequest = Depends(json_body(WorkflowCreateRequest))):
+    """
+    Create a new workflow definition.
+
+    The workflow will be saved as a YAML file and can be executed immediately.
+    """
+    workflow_config = _workflow_config(request)
+
     try:
-        filepath = workflow_manager.save_workflow(workflow_config)
+        filepath = await asyncio.to_thread(workflow_manager.save_workflow, workflow_config)
         return {
             "status": "created",
             "workflow_name": request.name,
@@ -1145,32 +1409,28 @@ async def create_workflow(request: WorkflowCreateRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create workflow: {str(e)}")
 
 
-@app.put("/api/workflows/{workflow_name}", tags=["workflows"], summary="Update a workflow")
-async def update_workflow(workflow_name: str, request: WorkflowCreateRequest):
+@app.put("/api/workflows/{workflow_name}", tags=["workflows"], summary="Update a workflow", openapi_extra=json_body_schema(WorkflowCreateRequest))
+async def update_workflow(workflow_name: str, request: WorkflowCreateRequest = Depends(json_body(WorkflowCreateRequest))):
     """
     Update an existing workflow definition.
 
     This will overwrite the existing workflow file with the new configuration.
     """
     # Check if workflow exists
-    existing_workflow = workflow_manager.load_workflow(workflow_name)
+    existing_workflow = await asyncio.to_thread(workflow_manager.load_workflow, workflow_name)
     if not existing_workflow:
         raise HTTPException(status_code=404, detail=f"Workflow '{workflow_name}' not found")
 
     # If the name is changing, delete the old file
     if request.name != workflow_name:
-        workflow_manager.delete_workflow(workflow_name)
+        await asyncio.to_thread(workflow_manager.delete_workflow, workflow_name)
+    _workflow_json_cache.pop(workflow_name, None)
+    _workflow_json_cache.pop(request.name, None)
 
-    workflow_config = {
-        "name": request.name,
-        "description": request.description,
-        "version": request.version,
-        "steps": request.steps,
-        "metadata": request.metadata or {}
-    }
+    workflow_config = _workflow_config(request)
 
     try:
-        filepath = workflow_manager.save_workflow(workflow_config)
+        filepath = await asyncio.to_thread(workflow_manager.save_workflow, workflow_config)
         return {
             "status": "updated",
             "workflow_name": request.name,
@@ -1183,7 +1443,8 @@ async def update_workflow(workflow_name: str, request: WorkflowCreateRequest):
 @app.delete("/api/workflows/{workflow_name}", tags=["workflows"], summary="Delete a workflow")
 async def delete_workflow(workflow_name: str):
     """Delete a workflow definition"""
-    success = workflow_manager.delete_workflow(workflow_name)
+    success = await asyncio.to_thread(workflow_manager.delete_workflow, workflow_name)
+    _workflow_json_cache.pop(workflow_name, None)
     if not success:
         raise HTTPException(status_code=404, detail=f"Workflow '{workflow_name}' not found")
 
@@ -1196,25 +1457,85 @@ async def delete_workflow(workflow_name: str):
 @app.get("/api/executions/{execution_id}", tags=["workflows"], summary="Get execution status")
 async def get_execution_status(execution_id: str):
     """Get the status and results of a workflow execution"""
-    if execution_id not in executions:
+    execution = executions.get(execution_id)
+    if execution is None:
         raise HTTPException(status_code=404, detail=f"Execution '{execution_id}' not found")
 
-    execution = executions[execution_id]
-    return execution.to_dict()
+    # Encoded by orjson directly (skips FastAPI's jsonable_encoder pass over step results)
+    return ORJSONResponse(execution.to_dict())
+
+
+@app.delete("/api/executions/{execution_id}", tags=["workflows"], summary="Cancel an execution")
+async def cancel_execution(execution_id: str):
+    """Cancel a pending or running workflow execution"""
+    execution = executions.get(execution_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail=f"Execution '{execution_id}' not found")
+
+    if execution.is_finished:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Execution '{execution_id}' already finished with status '{execution.status}'"
+        )
+
+    execution.cancel()
+    task = running_tasks.pop(execution_id, None)
+    if task:
+        task.cancel()
+
+    return {
+        "status": "cancelled",
+        "execution_id": execution_id
+    }
 
 
 @app.get("/api/executions", tags=["workflows"], summary="List recent executions")
 async def list_executions(limit: int = 20):
     """List recent workflow executions"""
-    recent = sorted(
-        executions.values(),
-        key=lambda e: e.start_time,
-        reverse=True
-    )[:limit]
+    recent = executions.recent(limit)
 
-    return {
+    return ORJSONResponse({
         "count": len(recent),
         "executions": [e.to_dict() for e in recent]
+    })
+
+
+# ============================================================================
+# Batch Endpoint
+# ============================================================================
+
+@app.post("/api/batch", tags=["system"], summary="Execute several API calls at once")
+async def batch_requests(request: BatchRequest):
+    """
+    Execute multiple API calls in a single HTTP round-trip.
+
+    Sub-requests are dispatched concurrently and in-process (no network hop)
+    against the regular API routes. Each response carries the sub-request
+    ID, HTTP status and decoded body, in the same order as the input.
+    """
+    for sub in request.requests:
+        if not sub.path.startswith("/api/") or sub.path.startswith("/api/batch"):
+            raise HTTPException(status_code=400, detail=f"Invalid batch path: '{sub.path}'")
+
+    async def dispatch(client: httpx.AsyncClient, sub: BatchSubRequest) -> Dict[str, Any]:
+        response = await client.request(
+            sub.method.upper(),
+            sub.path,
+            json=sub.body if sub.body is not None else None
+        )
+        try:
+            body = orjson.loads(response.content)
+        except ValueError:
+            body = response.text
+        return {"id": sub.id, "status": response.status_code, "body": body}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backoffice") as client:
+        responses = await asyncio.gather(*[dispatch(client, sub) for sub in request.requests])
+
+    return {
+        "count": len(responses),
+        "responses": responses
     }
 
 
@@ -1222,14 +1543,27 @@ async def list_executions(limit: int = 20):
 # Exception Handlers
 # ============================================================================
 
+# (100ms tick, ISO timestamp) reused by error responses within the same tick
+_error_ts_cache = (0, "")
+
+
+def _error_timestamp() -> str:
+    """Current ISO timestamp at 100ms granularity, formatted at most once per tick"""
+    global _error_ts_cache
+    tick = time.time_ns() // 100_000_000
+    if _error_ts_cache[0] != tick:
+        _error_ts_cache = (tick, datetime.fromtimestamp(tick / 10).isoformat(timespec="milliseconds"))
+    return _error_ts_cache[1]
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": str(exc),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _error_timestamp()
         }
     )
 
@@ -1238,57 +1572,177 @@ async def global_exception_handler(request, exc):
 # Startup/Shutdown Events
 # ============================================================================
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize on startup"""
-    global orchestrator
+async def _discover_plugins() -> int:
+    """
+    Discover plugins without blocking the event loop.
+    Manifests are parsed concurrently in worker threads, then registered in
+    discovery order so runtime agents still override examples.
+    """
+    manifests = await asyncio.to_thread(plugin_registry.find_manifests)
+    loaded = await asyncio.gather(*[
+        asyncio.to_thread(plugin_registry.load_manifest, plugin_yml)
+        for plugin_yml, _ in manifests
+    ])
+    plugin_registry.register_manifests([
+        (manifest, source) for (_, source), manifest in zip(manifests, loaded) if manifest
+    ])
 
-    print(f"Starting Backoffice API...")
-    print(f"Workflows (runtime): {WORKFLOWS_DIR}")
-    print(f"Workflows (examples): {WORKFLOWS_EXAMPLES_DIR}")
-    print(f"Agent definitions directory: {AGENT_DEFINITIONS_DIR}")
-    print(f"Compose directory: {COMPOSE_DIR}")
-    print(f"Examples directory: {EXAMPLES_DIR}")
+    await asyncio.to_thread(plugin_registry.discover_from_docker)
+    return len(plugin_registry.list_all())
 
-    # Ensure directories exist
-    WORKFLOWS_DIR.mkdir(parents=True, exist_ok=True)
-    AGENT_DEFINITIONS_DIR.mkdir(parents=True, exist_ok=True)
-    COMPOSE_DIR.mkdir(parents=True, exist_ok=True)
+
+async def _initialize_plugins():
+    """Discover plugins and build the orchestrator, then mark the API ready"""
+    global orchestrator, plugin_init_error
 
     # Discover plugins
     print(f"\n🔌 Discovering plugins...")
-    plugin_count = plugin_registry.discover_all()
-    print(f"✓ Discovered {plugin_count} plugins")
+    try:
+        plugin_count = await _discover_plugins()
+    except Exception:
+        # Keep the API usable with whatever was registered before the failure
+        print("✗ Plugin discovery failed, continuing with the plugins registered so far:")
+        traceback.print_exc()
+        plugin_count = len(plugin_registry.list_all())
 
-    # List discovered plugins
+    # List discovered plugins (collected and written in one go rather than a write per plugin)
+    lines = [f"✓ Discovered {plugin_count} plugins"]
     for plugin_id, plugin_data in plugin_registry.list_all().items():
         manifest = plugin_data.get("manifest")
         if manifest:
-            print(f"  • {plugin_id} - {manifest.get('name', plugin_id)} v{manifest.get('version', '1.0.0')}")
+            lines.append(f"  • {plugin_id} - {manifest.get('name', plugin_id)} v{manifest.get('version', '1.0.0')}")
         else:
-            print(f"  • {plugin_id} (no manifest)")
+            lines.append(f"  • {plugin_id} (no manifest)")
+    print("\n".join(lines))
 
     # Initialize orchestrator with discovered plugins
-    agent_registry_legacy = plugin_registry.to_legacy_registry()
-    orchestrator = WorkflowOrchestrator(agent_registry_legacy)
-    print(f"✓ Orchestrator initialized with {len(agent_registry_legacy)} agents\n")
+    try:
+        agent_registry_legacy = plugin_registry.to_legacy_registry()
+        orchestrator = WorkflowOrchestrator(agent_registry_legacy)
+        print(f"✓ Orchestrator initialized with {len(agent_registry_legacy)} agents\n")
+    except Exception as e:
+        # Guarded endpoints report this instead of waiting for discovery forever
+        print("✗ Orchestrator initialization failed:")
+        traceback.print_exc()
+        plugin_init_error = f"{type(e).__name__}: {e}"
+    finally:
+        plugins_ready.set()
+
+
+async def startup_event():
+    """Initialize on startup"""
+    print(
+        f"Starting Backoffice API...\n"
+        f"Workflows (runtime): {WORKFLOWS_DIR}\n"
+        f"Workflows (examples): {WORKFLOWS_EXAMPLES_DIR}\n"
+        f"Agent definitions directory: {AGENT_DEFINITIONS_DIR}\n"
+        f"Compose directory: {COMPOSE_DIR}\n"
+        f"Examples directory: {EXAMPLES_DIR}"
+    )
+
+    # Shared HTTP client and per-container /info cache for agent discovery
+    app.state.http = httpx.AsyncClient(timeout=2.0)
+    app.state.agent_info_cache = {}
+
+    # Ensure directories exist
+    WORKFLOWS_DIR.mkdir(parents=True, exist_ok=True)
+    AGENT_DEFINITIONS_DIR.mkdir(parents=True, exist_ok=True)
+    COMPOSE_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Plugin discovery runs in the background so health checks answer right away;
+    # endpoints that need the orchestrator return 503 until it completes
+    app.state.plugin_init_task = asyncio.create_task(_initialize_plugins())
 
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    await orchestrator.close()
+    app.state.plugin_init_task.cancel()
+    for task in list(running_tasks.values()):
+        task.cancel()
+
+    # Close independent resources concurrently; one failing close must not skip the others
+    closers = [app.state.http.aclose(), asyncio.to_thread(plugin_registry.close)]
+    if orchestrator:
+        closers.append(orchestrator.close())
+
+    try:
+        results = await asyncio.wait_for(asyncio.gather(*closers, return_exceptions=True), timeout=10)
+    except asyncio.TimeoutError:
+        print("Shutdown cleanup timed out after 10s")
+        return
+
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error during shutdown: {result}")
 
 
 # ============================================================================
 # Static Files (Frontend)
 # ============================================================================
 
-# Serve frontend static files (CSS, JS, etc.) but not HTML to avoid intercepting API routes
-# The root endpoint at "/" already handles serving index.html
-if FRONTEND_DIR.exists():
-    # Mount static files at /static to avoid conflicts with API routes
-    app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
+# Only compress assets where gzip is worth the extra header/CPU on the client
+STATIC_GZIP_MIN_SIZE = 1024
+
+
+def _load_static_files(frontend_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the frontend bundle into memory once.
+
+    Args:
+        frontend_dir: Directory containing the frontend files
+
+    Returns:
+        Dictionary mapping relative paths to content, gzipped content, ETag and media type
+    """
+    files = {}
+    for filepath in frontend_dir.rglob("*"):
+        if not filepath.is_file():
+            continue
+
+        content = filepath.read_bytes()
+        media_type = mimetypes.guess_type(filepath.name)[0] or "application/octet-stream"
+        files[filepath.relative_to(frontend_dir).as_posix()] = {
+            "content": content,
+            "gzip": gzip.compress(content, compresslevel=6) if len(content) >= STATIC_GZIP_MIN_SIZE else None,
+            "etag": f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"',
+            "media_type": media_type,
+        }
+    return files
+
+
+def _static_response(request: Request, entry: Dict[str, Any]) -> Response:
+    """Serve a cached static file, honoring If-None-Match and Accept-Encoding"""
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if entry["etag"] in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    content = entry["content"]
+    if entry["gzip"] and "gzip" in request.headers.get("accept-encoding", ""):
+        content = entry["gzip"]
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=content, media_type=entry["media_type"], headers=headers)
+
+
+# The frontend is baked into the image, so it is read (and hashed) once instead of
+# stat'ing and reading files on every request.
+# Only CSS, JS, etc. are served under /static; the root endpoint at "/" serves index.html
+static_files = _load_static_files(FRONTEND_DIR) if FRONTEND_DIR.exists() else {}
+
+
+@app.get("/static/{path:path}", include_in_schema=False)
+async def serve_static(path: str, request: Request):
+    """Serve frontend static files from the in-memory cache"""
+    entry = static_files.get(path)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return _static_response(request, entry)
 
 
 # ============================================================================
@@ -1296,79 +1750,10 @@ if FRONTEND_DIR.exists():
 # Import/Export Endpoints
 # ============================================================================
 
-@app.get("/api/agents/{agent_name}/export", tags=["agents"], summary="Export agent as ZIP bundle")
-async def export_agent(agent_name: str):
-    """
-    Export a complete agent bundle as a ZIP file containing:
-    - Agent definition YAML
-    - Docker compose service definition
-    - Environment file
-    - Agent-specific files (prompt.txt, config.yml, etc.)
-    - Plugin manifest (if exists)
-    """
-    import tempfile
-    import zipfile
-    import shutil
-    from pathlib import Path as PathlibPath
-    
-    # Get agent definition
-    definition = agent_manager.get_agent_definition(agent_name)
-    if not definition:
-        debug_info = f"Looking in: {agent_manager.definitions_dir}. Files found: {[f.name for f in agent_manager.definitions_dir.glob('*.yml')]}"
-        print(f"DEBUG: {debug_info}")
-        raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found. {debug_info}")
-
-    # Create temporary directory for bundle
-    temp_dir = tempfile.mkdtemp(prefix=f"agent_export_{agent_name}_")
-    zip_path = None
-    
-    try:
-        bundle_dir = PathlibPath(temp_dir) / agent_name
-        bundle_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 1. Save agent definition YAML
-        agent_def_content = yaml.dump(definition, default_flow_style=False, sort_keys=False)
-        (bundle_dir / "agent.yml").write_text(agent_def_content)
-        
-        # 2. Find and copy docker-compose service definition
-        compose_paths = [
-            PROJECT_ROOT / "runtime" / "compose" / f"{agent_name}.yml",
-            PROJECT_ROOT / "examples" / "compose" / f"{agent_name}.yml"
-        ]
-        for compose_path in compose_paths:
-            if compose_path.exists():
-                shutil.copy2(compose_path, bundle_dir / "docker-compose.yml")
-                break
-        
-        # 3. Find and copy environment file
-        env_paths = [
-            PROJECT_ROOT / "runtime" / "compose" / f".env.{agent_name}",
-            PROJECT_ROOT / "examples" / "compose" / f".env.{agent_name}"
-        ]
-        for env_path in env_paths:
-            if env_path.exists():
-                shutil.copy2(env_path, bundle_dir / ".env")
-                break
-        
-        # 4. Copy agent-specific files from agent directory
-        agent_dir_paths = [
-            PROJECT_ROOT / "agents" / agent_name,
-            PROJECT_ROOT / "runtime" / "agents" / agent_name,
-            PROJECT_ROOT / "examples" / "agents" / agent_name
-        ]
-        
-        for agent_dir in agent_dir_paths:
-            if agent_dir.exists() and agent_dir.is_dir():
-                # Copy all files from agent directory
-                for item in agent_dir.iterdir():
-                    if item.is_file():
-                        shutil.copy2(item, bundle_dir / item.name)
-                break
-        
-        # 5. Create README with import instructions
-        readme_content = f"""# Agent Bundle: {agent_name}
+# README added to exported bundles (filled with the bundle name and export time)
+AGENT_README_TEMPLATE = """# Agent Bundle: {name}
 
-This bundle contains all files needed to deploy the '{agent_name}' agent.
+This bundle contains all files needed to deploy the '{name}' agent.
 
 ## Contents
 
@@ -1390,45 +1775,374 @@ This bundle contains all files needed to deploy the '{agent_name}' agent.
 
 Alternatively, you can manually extract this bundle:
 
-1. Extract to `runtime/agents/{agent_name}/`
-2. Copy `agent.yml` to `runtime/agent-definitions/{agent_name}.yml`
-3. Copy `docker-compose.yml` to `runtime/compose/{agent_name}.yml`
-4. Copy `.env` to `runtime/compose/.env.{agent_name}`
+1. Extract to `runtime/agents/{name}/`
+2. Copy `agent.yml` to `runtime/agent-definitions/{name}.yml`
+3. Copy `docker-compose.yml` to `runtime/compose/{name}.yml`
+4. Copy `.env` to `runtime/compose/.env.{name}`
 5. Use the backoffice to deploy the agent
 
 ---
-Exported: {datetime.now().isoformat()}
+Exported: {exported}
 """
-        (bundle_dir / "README.md").write_text(readme_content)
-        
-        # Create ZIP archive
-        zip_path = PathlibPath(temp_dir) / f"{agent_name}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in bundle_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(bundle_dir.parent)
-                    zipf.write(file_path, arcname)
-        
-        # Return ZIP file
-        return FileResponse(
-            path=str(zip_path),
-            media_type="application/zip",
-            filename=f"{agent_name}.zip",
-            headers={
-                "Content-Disposition": f"attachment; filename={agent_name}.zip"
-            }
-        )
+
+WORKFLOW_README_TEMPLATE = """# Workflow Bundle: {name}
+
+This bundle contains the workflow definition for '{name}'.
+
+## Contents
+
+- `workflow.yml` - Workflow definition
+
+## Import Instructions
+
+1. Go to the Backoffice UI
+2. Navigate to the Workflows tab
+3. Click "Import Workflow"
+4. Select this ZIP file
+5. Choose whether to overwrite if the workflow already exists
+6. Execute the workflow from the Execute tab
+
+## Manual Import
+
+Alternatively, you can manually extract this bundle:
+
+1. Extract to `runtime/workflows/{name}.yml`
+2. Reload workflows in the backoffice
+
+---
+Exported: {exported}
+"""
+
+
+class _ZipStreamSink:
+    """Write-only, unseekable file object that hands zipfile output back in chunks"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_zip(entries: List[tuple], compress: bool = False):
+    """
+    Build a ZIP archive on the fly, yielding bytes as each entry is written.
+
+    Args:
+        entries: List of (arcname, source) where source is a Path to read or str/bytes content
+        compress: Deflate entries (level 1) instead of storing them; bundles are a few KB
+                  of text, so compression costs CPU for a negligible size win by default
+
+    Yields:
+        Chunks of the ZIP archive
+    """
+    sink = _ZipStreamSink()
+    if compress:
+        zipf = zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+    else:
+        zipf = zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED)
+    with zipf:
+        for arcname, source in entries:
+            if isinstance(source, Path):
+                zipf.write(source, arcname)
+            else:
+                zipf.writestr(arcname, source)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory is written on close
+    yield sink.drain()
+
+
+# Worker threads used to extract bundle files on import
+IMPORT_COPY_WORKERS = 8
+
+# Upper bound for uploaded bundles, both compressed and extracted
+MAX_BUNDLE_SIZE = 50 * 1024 * 1024
+
+# Bundle files with a dedicated destination (everything else goes to the agent directory)
+RESERVED_BUNDLE_FILES = frozenset({"agent.yml", "docker-compose.yml", ".env", "README.md"})
+
+# Names of imported agents/workflows become file and directory names
+BUNDLE_NAME_PATTERN = re.compile(r"\A[A-Za-z0-9][A-Za-z0-9_-]{0,63}\Z")
+
+
+def _read_first(paths: List[Path]) -> Optional[bytes]:
+    """Read the first of `paths` that exists (one open attempt per candidate, no exists() race)"""
+    for path in paths:
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file, measured on its spooled temp file"""
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+async def _read_upload(file: UploadFile, max_size: int, chunk_size: int = 1 << 20) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it exceeds max_size"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(status_code=400, detail=f"File too large (max {max_size // (1024 * 1024)}MB)")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _receive_zip(file: UploadFile, max_size: int = MAX_BUNDLE_SIZE) -> zipfile.ZipFile:
+    """Size-check an uploaded bundle and open it in place (the upload is already spooled by Starlette)"""
+    if _upload_size(file) > max_size:
+        raise HTTPException(status_code=400, detail=f"ZIP file too large (max {max_size // (1024 * 1024)}MB)")
+    return await asyncio.to_thread(zipfile.ZipFile, file.file, 'r')
+
+
+def _validate_zip_members(zipf: zipfile.ZipFile) -> List[str]:
+    """
+    Check a bundle before reading anything out of it.
+
+    Returns:
+        File member names (directory entries are skipped)
+    """
+    members = []
+    total_size = 0
+    for info in zipf.infolist():
+        # Prevent path traversal (ZipSlip): absolute paths, drive letters or ".." segments
+        normalized = info.filename.replace("\\", "/")
+        if normalized.startswith("/") or normalized[1:2] == ":" or ".." in normalized.split("/"):
+            raise HTTPException(status_code=400, detail=f"Invalid ZIP structure: unsafe path '{info.filename}'")
+        if info.is_dir():
+            continue
+        members.append(info.filename)
+        total_size += info.file_size
+
+    if total_size > MAX_BUNDLE_SIZE:
+        raise HTTPException(status_code=400, detail="ZIP contents too large (max 50MB uncompressed)")
+
+    return members
+
+
+def _find_bundle_member(members: List[str], filename: str) -> Optional[str]:
+    """Find a file in the bundle (at the root or inside the bundle folder), shallowest first"""
+    matches = [name for name in members if name == filename or name.endswith(f"/{filename}")]
+    return min(matches, key=lambda name: name.count("/")) if matches else None
+
+
+def _locate_bundle_file(zipf: zipfile.ZipFile, filename: str) -> Tuple[List[str], str]:
+    """
+    Validate a bundle and find its definition file.
+
+    Returns:
+        (members, definition member name)
+    """
+    members = _validate_zip_members(zipf)
+    definition_name = _find_bundle_member(members, filename)
+    if not definition_name:
+        raise HTTPException(status_code=400, detail=f"Invalid bundle: {filename} not found")
+    return members, definition_name
+
+
+def _extract_member(zipf: zipfile.ZipFile, name: str, dest: Path):
+    """Stream a single archive member to dest"""
+    with zipf.open(name) as src, open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst, length=1 << 20)
+
+
+def _zip_response(entries: List[tuple], filename: str, compress: bool = False) -> StreamingResponse:
+    """Stream a ZIP bundle as a file download"""
+    return StreamingResponse(
+        _iter_zip(entries, compress),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
+
+
+def _bundle_response(name: str, entries: List[tuple], readme_template: str, compress: bool = False) -> StreamingResponse:
+    """Add the import README to a bundle's entries and stream it as {name}.zip"""
+    readme_content = readme_template.format_map({"name": name, "exported": datetime.now().isoformat()})
+    entries.append((f"{name}/README.md", readme_content))
+    return _zip_response(entries, f"{name}.zip", compress)
+
+
+def _export_agent_sync(agent_name: str, definition: Dict[str, Any]) -> List[tuple]:
+    """
+    Collect the bundle entries for an agent export (YAML dump + file lookups).
+    Blocking; called from export_agent via asyncio.to_thread.
+    """
+    # 1. Agent definition YAML
+    agent_def_content = _yaml_dump(definition)
+    entries = [(f"{agent_name}/agent.yml", agent_def_content)]
+    
+    # 2. Find docker-compose service definition
+    compose_paths = [
+        PROJECT_ROOT / "runtime" / "compose" / f"{agent_name}.yml",
+        PROJECT_ROOT / "examples" / "compose" / f"{agent_name}.yml"
+    ]
+    compose_content = _read_first(compose_paths)
+    if compose_content is not None:
+        entries.append((f"{agent_name}/docker-compose.yml", compose_content))
+    
+    # 3. Find environment file
+    env_paths = [
+        PROJECT_ROOT / "runtime" / "compose" / f".env.{agent_name}",
+        PROJECT_ROOT / "examples" / "compose" / f".env.{agent_name}"
+    ]
+    env_content = _read_first(env_paths)
+    if env_content is not None:
+        entries.append((f"{agent_name}/.env", env_content))
+    
+    # 4. Agent-specific files from agent directory
+    agent_dir_paths = [
+        PROJECT_ROOT / "agents" / agent_name,
+        PROJECT_ROOT / "runtime" / "agents" / agent_name,
+        PROJECT_ROOT / "examples" / "agents" / agent_name
+    ]
+    
+    for agent_dir in agent_dir_paths:
+        try:
+            with os.scandir(agent_dir) as it:
+                # Include all files from agent directory (except .<name>.yml.json parse caches)
+                entries.extend(
+                    (f"{agent_name}/{entry.name}", Path(entry.path))
+                    for entry in it
+                    if entry.is_file() and not (entry.name.startswith(".") and entry.name.endswith(".yml.json"))
+                )
+            break
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    
+    return entries
+
+
+@app.get("/api/agents/{agent_name}/export", tags=["agents"], summary="Export agent as ZIP bundle")
+async def export_agent(agent_name: str, compress: bool = False):
+    """
+    Export a complete agent bundle as a ZIP file containing:
+    - Agent definition YAML
+    - Docker compose service definition
+    - Environment file
+    - Agent-specific files (prompt.txt, config.yml, etc.)
+    - Plugin manifest (if exists)
+
+    Entries are stored uncompressed unless `compress=true` is passed.
+    """
+    # Get agent definition
+    definition = agent_manager.get_agent_definition(agent_name)
+    if not definition:
+        debug_info = f"Looking in: {agent_manager.definitions_dir}. Files found: {[f.name for f in agent_manager.definitions_dir.glob('*.yml')]}"
+        print(f"DEBUG: {debug_info}")
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found. {debug_info}")
+
+    # Bundle entries are collected off the event loop and compressed straight into the response
+    try:
+        entries = await asyncio.to_thread(_export_agent_sync, agent_name, definition)
+        return _bundle_response(agent_name, entries, AGENT_README_TEMPLATE, compress)
     
     except Exception as e:
-        # Clean up on error
-        if temp_dir and PathlibPath(temp_dir).exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
+def _import_agent_sync(zipf: zipfile.ZipFile, overwrite: bool) -> Dict[str, Any]:
+    """
+    Validate an agent bundle and write its files into runtime/.
+    Blocking; called from import_agent via asyncio.to_thread.
+
+    Returns:
+        Import result with agent_name and files_imported
+    """
+    # Members are read straight out of the archive, no extraction to disk
+    members, agent_yml_name = _locate_bundle_file(zipf, "agent.yml")
     
-    finally:
-        # Note: We can't clean up temp_dir here because FileResponse needs the file
-        # The file will be cleaned up by the OS eventually
-        pass
+    bundle_prefix = agent_yml_name[:-len("agent.yml")]
+    
+    # Load and validate agent definition
+    agent_yml_content = zipf.read(agent_yml_name)
+    definition = _yaml_load(agent_yml_content)
+    
+    if "agent" not in definition or "name" not in definition["agent"]:
+        raise HTTPException(status_code=400, detail="Invalid agent definition: missing agent name")
+    
+    agent_name = definition["agent"]["name"]
+    
+    # Sanitize agent name to prevent path injection
+    if not isinstance(agent_name, str) or not BUNDLE_NAME_PATTERN.match(agent_name):
+        raise HTTPException(status_code=400, detail=f"Invalid agent name: '{agent_name}' contains unsafe characters")
+    
+    # Check if exists
+    existing = agent_manager.get_agent_definition(agent_name)
+    if existing and not overwrite:
+        raise HTTPException(
+            status_code=409, 
+            detail=f"Agent '{agent_name}' already exists. Set overwrite=true to replace."
+        )
+    
+    # Files directly in the bundle root, keyed by file name
+    bundle_files = {
+        name[len(bundle_prefix):]: name for name in members
+        if name.startswith(bundle_prefix) and "/" not in name[len(bundle_prefix):]
+    }
+    
+    # Track imported files
+    imported_files = []
+    
+    # 1. Create agent directory structure
+    runtime_agent_dir = PROJECT_ROOT / "runtime" / "agents" / agent_name
+    runtime_agent_dir.mkdir(parents=True, exist_ok=True)
+    
+    # 2. Extract agent-specific files to agent directory (in parallel, bundles hold many small files)
+    agent_files = [
+        filename for filename in bundle_files
+        if filename not in RESERVED_BUNDLE_FILES
+    ]
+    with ThreadPoolExecutor(max_workers=IMPORT_COPY_WORKERS) as executor:
+        list(executor.map(
+            lambda filename: _extract_member(zipf, bundle_files[filename], runtime_agent_dir / filename),
+            agent_files
+        ))
+    imported_files.extend(f"agents/{agent_name}/{filename}" for filename in agent_files)
+    
+    # 3. Save agent definition
+    agent_def_path = PROJECT_ROOT / "runtime" / "agent-definitions" / f"{agent_name}.yml"
+    agent_def_path.parent.mkdir(parents=True, exist_ok=True)
+    agent_def_path.write_bytes(agent_yml_content)
+    imported_files.append(f"agent-definitions/{agent_name}.yml")
+    
+    # 4. Save docker-compose service definition if exists
+    if "docker-compose.yml" in bundle_files:
+        compose_dest = PROJECT_ROOT / "runtime" / "compose" / f"{agent_name}.yml"
+        compose_dest.parent.mkdir(parents=True, exist_ok=True)
+        _extract_member(zipf, bundle_files["docker-compose.yml"], compose_dest)
+        imported_files.append(f"compose/{agent_name}.yml")
+    
+    # 5. Save environment file if exists
+    if ".env" in bundle_files:
+        env_dest = PROJECT_ROOT / "runtime" / "compose" / f".env.{agent_name}"
+        env_dest.parent.mkdir(parents=True, exist_ok=True)
+        _extract_member(zipf, bundle_files[".env"], env_dest)
+        imported_files.append(f"compose/.env.{agent_name}")
+
+    return {"agent_name": agent_name, "files_imported": imported_files}
 
 
 @app.post("/api/agents/import", tags=["agents"], summary="Import agent from ZIP bundle")
@@ -1440,18 +2154,13 @@ async def import_agent(
     Import a complete agent bundle from a ZIP file.
     Extracts and validates all files, then creates the agent structure.
     """
-    import tempfile
-    import zipfile
-    import shutil
-    from pathlib import Path as PathlibPath
-    
     # Validate file type
     if not file.filename.endswith('.zip'):
         # Try to support legacy YAML imports
         if file.filename.endswith('.yml') or file.filename.endswith('.yaml'):
             try:
-                content = await file.read()
-                definition = yaml.safe_load(content)
+                content = await _read_upload(file, MAX_BUNDLE_SIZE)
+                definition = _yaml_load(content)
 
                 # Basic validation
                 if "agent" not in definition or "name" not in definition["agent"]:
@@ -1470,7 +2179,7 @@ async def import_agent(
                 # Save definition (legacy YAML-only import)
                 filepath = agent_manager.definitions_dir / f"{agent_name}.yml"
                 with open(filepath, "w") as f:
-                    yaml.dump(definition, f, default_flow_style=False, sort_keys=False)
+                    _yaml_dump(definition, f)
 
                 return {
                     "status": "success",
@@ -1488,101 +2197,17 @@ async def import_agent(
         else:
             raise HTTPException(status_code=400, detail="File must be a ZIP bundle or YAML file")
     
-    # Create temporary directory for extraction
-    temp_dir = tempfile.mkdtemp(prefix="agent_import_")
-    
     try:
-        # Save uploaded file
-        zip_path = PathlibPath(temp_dir) / file.filename
-        with open(zip_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Validate ZIP file size (max 50MB)
-        if zip_path.stat().st_size > 50 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="ZIP file too large (max 50MB)")
-        
-        # Extract ZIP
-        extract_dir = PathlibPath(temp_dir) / "extracted"
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zipf:
-            # Validate ZIP structure - prevent path traversal
-            for member in zipf.namelist():
-                if member.startswith('/') or '..' in member:
-                    raise HTTPException(status_code=400, detail=f"Invalid ZIP structure: unsafe path '{member}'")
-            
-            zipf.extractall(extract_dir)
-        
-        # Find agent.yml in extracted files
-        agent_yml_candidates = list(extract_dir.rglob("agent.yml"))
-        if not agent_yml_candidates:
-            raise HTTPException(status_code=400, detail="Invalid bundle: agent.yml not found")
-        
-        agent_yml_path = agent_yml_candidates[0]
-        bundle_root = agent_yml_path.parent
-        
-        # Load and validate agent definition
-        with open(agent_yml_path, 'r') as f:
-            definition = yaml.safe_load(f)
-        
-        if "agent" not in definition or "name" not in definition["agent"]:
-            raise HTTPException(status_code=400, detail="Invalid agent definition: missing agent name")
-        
-        agent_name = definition["agent"]["name"]
-        
-        # Sanitize agent name to prevent path injection
-        if not agent_name.replace('-', '').replace('_', '').isalnum():
-            raise HTTPException(status_code=400, detail=f"Invalid agent name: '{agent_name}' contains unsafe characters")
-        
-        # Check if exists
-        existing = agent_manager.get_agent_definition(agent_name)
-        if existing and not overwrite:
-            raise HTTPException(
-                status_code=409, 
-                detail=f"Agent '{agent_name}' already exists. Set overwrite=true to replace."
-            )
-        
-        # Track imported files
-        imported_files = []
-        
-        # 1. Create agent directory structure
-        runtime_agent_dir = PROJECT_ROOT / "runtime" / "agents" / agent_name
-        runtime_agent_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 2. Copy agent-specific files to agent directory
-        for item in bundle_root.iterdir():
-            if item.is_file() and item.name not in ["agent.yml", "docker-compose.yml", ".env", "README.md"]:
-                dest = runtime_agent_dir / item.name
-                shutil.copy2(item, dest)
-                imported_files.append(f"agents/{agent_name}/{item.name}")
-        
-        # 3. Save agent definition
-        agent_def_path = PROJECT_ROOT / "runtime" / "agent-definitions" / f"{agent_name}.yml"
-        agent_def_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(agent_yml_path, agent_def_path)
-        imported_files.append(f"agent-definitions/{agent_name}.yml")
-        
-        # 4. Save docker-compose service definition if exists
-        compose_file = bundle_root / "docker-compose.yml"
-        if compose_file.exists():
-            compose_dest = PROJECT_ROOT / "runtime" / "compose" / f"{agent_name}.yml"
-            compose_dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(compose_file, compose_dest)
-            imported_files.append(f"compose/{agent_name}.yml")
-        
-        # 5. Save environment file if exists
-        env_file = bundle_root / ".env"
-        if env_file.exists():
-            env_dest = PROJECT_ROOT / "runtime" / "compose" / f".env.{agent_name}"
-            shutil.copy2(env_file, env_dest)
-            imported_files.append(f"compose/.env.{agent_name}")
+        # Zip parsing and file writes run in a worker thread to keep the event loop free
+        with await _receive_zip(file) as zipf:
+            result = await asyncio.to_thread(_import_agent_sync, zipf, overwrite)
+        agent_name = result["agent_name"]
         
         return {
             "status": "success",
             "message": f"Agent '{agent_name}' imported successfully",
             "agent_name": agent_name,
-            "files_imported": imported_files,
+            "files_imported": result["files_imported"],
             "note": "Agent definition imported. Use the Deploy button to start the agent."
         }
 
@@ -1593,121 +2218,70 @@ async def import_agent(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
+
+
+def _export_workflow_sync(workflow_name: str, workflow) -> List[tuple]:
+    """
+    Collect the bundle entries for a workflow export.
+    Blocking; called from export_workflow via asyncio.to_thread.
+    """
+    # 1. Get workflow YAML content (file bytes go into the bundle as-is)
+    workflow_paths = [workflow_manager.workflows_dir / f"{workflow_name}.yml"]
+    if workflow_manager.examples_dir:
+        workflow_paths.append(workflow_manager.examples_dir / f"{workflow_name}.yml")
+
+    yaml_content = _read_first(workflow_paths)
+    if yaml_content is None:
+        # Fallback: construct from object
+        data = {
+            "name": workflow.name,
+            "description": workflow.description,
+            "version": workflow.version,
+            "steps": [
+                {
+                    "name": step.name,
+                    "agent": step.agent,
+                    "input": step.input_source,
+                } for step in workflow.steps
+            ]
+        }
+        yaml_content = _yaml_dump(data)
     
-    finally:
-        # Clean up temporary directory
-        if temp_dir and PathlibPath(temp_dir).exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
+    return [(f"{workflow_name}/workflow.yml", yaml_content)]
 
 
 @app.get("/api/workflows/{workflow_name}/export", tags=["workflows"], summary="Export workflow as ZIP bundle")
-async def export_workflow(workflow_name: str):
+async def export_workflow(workflow_name: str, compress: bool = False):
     """
     Export a workflow bundle as a ZIP file containing:
     - Workflow definition YAML
     - README with import instructions
+
+    Entries are stored uncompressed unless `compress=true` is passed.
     """
-    import tempfile
-    import zipfile
-    import shutil
-    from pathlib import Path as PathlibPath
-    
     workflow = workflow_manager.load_workflow(workflow_name)
     if not workflow:
         raise HTTPException(status_code=404, detail=f"Workflow '{workflow_name}' not found")
 
-    # Create temporary directory for bundle
-    temp_dir = tempfile.mkdtemp(prefix=f"workflow_export_{workflow_name}_")
-    
     try:
-        bundle_dir = PathlibPath(temp_dir) / workflow_name
-        bundle_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 1. Get workflow YAML content
-        filepath = workflow_manager.workflows_dir / f"{workflow_name}.yml"
-        if not filepath.exists() and workflow_manager.examples_dir:
-            filepath = workflow_manager.examples_dir / f"{workflow_name}.yml"
-        
-        if filepath.exists():
-            with open(filepath, "r") as f:
-                yaml_content = f.read()
-        else:
-            # Fallback: construct from object
-            data = {
-                "name": workflow.name,
-                "description": workflow.description,
-                "version": workflow.version,
-                "steps": [
-                    {
-                        "name": step.name,
-                        "agent": step.agent,
-                        "input": step.input_source,
-                    } for step in workflow.steps
-                ]
-            }
-            yaml_content = yaml.dump(data, default_flow_style=False, sort_keys=False)
-        
-        # Save workflow YAML
-        (bundle_dir / "workflow.yml").write_text(yaml_content)
-        
-        # 2. Create README with import instructions
-        readme_content = f"""# Workflow Bundle: {workflow_name}
-
-This bundle contains the workflow definition for '{workflow_name}'.
-
-## Contents
-
-- `workflow.yml` - Workflow definition
-
-## Import Instructions
-
-1. Go to the Backoffice UI
-2. Navigate to the Workflows tab
-3. Click "Import Workflow"
-4. Select this ZIP file
-5. Choose whether to overwrite if the workflow already exists
-6. Execute the workflow from the Execute tab
-
-## Manual Import
-
-Alternatively, you can manually extract this bundle:
-
-1. Extract to `runtime/workflows/{workflow_name}.yml`
-2. Reload workflows in the backoffice
-
----
-Exported: {datetime.now().isoformat()}
-"""
-        (bundle_dir / "README.md").write_text(readme_content)
-        
-        # Create ZIP archive
-        zip_path = PathlibPath(temp_dir) / f"{workflow_name}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in bundle_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(bundle_dir.parent)
-                    zipf.write(file_path, arcname)
-        
-        # Return ZIP file
-        return FileResponse(
-            path=str(zip_path),
-            media_type="application/zip",
-            filename=f"{workflow_name}.zip",
-            headers={
-                "Content-Disposition": f"attachment; filename={workflow_name}.zip"
-            }
-        )
+        entries = await asyncio.to_thread(_export_workflow_sync, workflow_name, workflow)
+        return _bundle_response(workflow_name, entries, WORKFLOW_README_TEMPLATE, compress)
     
     except Exception as e:
-        # Clean up on error
-        if temp_dir and PathlibPath(temp_dir).exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
+def _read_workflow_bundle(zipf: zipfile.ZipFile) -> Any:
+    """
+    Validate a workflow bundle and parse its workflow.yml.
+    Blocking; called from import_workflow via asyncio.to_thread.
+    """
+    _, workflow_yml_name = _locate_bundle_file(zipf, "workflow.yml")
+    return _yaml_load(zipf.read(workflow_yml_name))
+
+
 @app.post("/api/workflows/import", tags=["workflows"], summary="Import workflow from ZIP bundle")
 async def import_workflow(
     file: UploadFile = File(...),
@@ -1716,18 +2290,13 @@ async def import_workflow(
     """
     Import a workflow bundle from a ZIP file.
     """
-    import tempfile
-    import zipfile
-    import shutil
-    from pathlib import Path as PathlibPath
-    
     # Validate file type
     if not file.filename.endswith('.zip'):
         # Try to support legacy YAML imports
         if file.filename.endswith('.yml') or file.filename.endswith('.yaml'):
             try:
-                content = await file.read()
-                definition = yaml.safe_load(content)
+                content = await _read_upload(file, MAX_BUNDLE_SIZE)
+                definition = _yaml_load(content)
 
                 # Basic validation
                 if "name" not in definition or "steps" not in definition:
@@ -1744,7 +2313,7 @@ async def import_workflow(
                     )
 
                 # Save using manager (legacy YAML-only import)
-                workflow_manager.save_workflow(definition)
+                await asyncio.to_thread(workflow_manager.save_workflow, definition)
 
                 return {
                     "status": "success",
@@ -1762,42 +2331,10 @@ async def import_workflow(
         else:
             raise HTTPException(status_code=400, detail="File must be a ZIP bundle or YAML file")
     
-    # Create temporary directory for extraction
-    temp_dir = tempfile.mkdtemp(prefix="workflow_import_")
-    
     try:
-        # Save uploaded file
-        zip_path = PathlibPath(temp_dir) / file.filename
-        with open(zip_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Validate ZIP file size (max 50MB)
-        if zip_path.stat().st_size > 50 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="ZIP file too large (max 50MB)")
-        
-        # Extract ZIP
-        extract_dir = PathlibPath(temp_dir) / "extracted"
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zipf:
-            # Validate ZIP structure - prevent path traversal
-            for member in zipf.namelist():
-                if member.startswith('/') or '..' in member:
-                    raise HTTPException(status_code=400, detail=f"Invalid ZIP structure: unsafe path '{member}'")
-            
-            zipf.extractall(extract_dir)
-        
-        # Find workflow.yml in extracted files
-        workflow_yml_candidates = list(extract_dir.rglob("workflow.yml"))
-        if not workflow_yml_candidates:
-            raise HTTPException(status_code=400, detail="Invalid bundle: workflow.yml not found")
-        
-        workflow_yml_path = workflow_yml_candidates[0]
-        
-        # Load and validate workflow definition
-        with open(workflow_yml_path, 'r') as f:
-            definition = yaml.safe_load(f)
+        # Read workflow.yml straight out of the archive, no extraction to disk
+        with await _receive_zip(file) as zipf:
+            definition = await asyncio.to_thread(_read_workflow_bundle, zipf)
         
         if "name" not in definition or "steps" not in definition:
             raise HTTPException(status_code=400, detail="Invalid workflow definition: missing name or steps")
@@ -1805,7 +2342,7 @@ async def import_workflow(
         workflow_name = definition["name"]
         
         # Sanitize workflow name
-        if not workflow_name.replace('-', '').replace('_', '').isalnum():
+        if not isinstance(workflow_name, str) or not BUNDLE_NAME_PATTERN.match(workflow_name):
             raise HTTPException(status_code=400, detail=f"Invalid workflow name: '{workflow_name}' contains unsafe characters")
         
         # Check if exists
@@ -1817,7 +2354,7 @@ async def import_workflow(
             )
         
         # Save using manager
-        workflow_manager.save_workflow(definition)
+        await asyncio.to_thread(workflow_manager.save_workflow, definition)
         
         return {
             "status": "success",
@@ -1833,14 +2370,8 @@ async def import_workflow(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
-    
-    finally:
-        # Clean up temporary directory
-        if temp_dir and PathlibPath(temp_dir).exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 # ============================================================================
@@ -1852,5 +2383,8 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        log_level="info",
+        # uvicorn's "auto" already picks uvloop/httptools when installed
+        loop=os.getenv("UVICORN_LOOP", "auto"),
+        http=os.getenv("UVICORN_HTTP", "auto")
     )
@@ -2,15 +2,337 @@
 """
 Deployment Manager Module
 Handles automated agent deployment with Docker support.
+
+Deploys are idempotent (every agent file is regenerated from its YAML definition),
+so flushing the files to disk is opt-in via AGENT_DEPLOY_FSYNC=1.
 """
 
 import os
+import math
+import re
+import json
 import yaml
 import docker
 import subprocess
+import threading
+import ctypes
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+
+# Prefer the LibYAML-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+
+
+# Seconds to wait on Docker API calls before giving up
+DOCKER_CLIENT_TIMEOUT = 10
+
+# Seconds a GPU detection result is reused before the daemon is asked again
+GPU_MODE_CACHE_TTL = float(os.getenv("GPU_MODE_CACHE_TTL", "300"))
+
+# Seconds a container listing is reused by get_agent_status (UI polls every agent)
+CONTAINER_STATUS_CACHE_TTL = float(os.getenv("CONTAINER_STATUS_CACHE_TTL", "2"))
+
+# Maximum number of agents deployed concurrently by deploy_agents
+DEPLOY_WORKERS = 4
+
+# Label set on the Ollama container by docker-compose.gpu.yml
+GPU_LABEL = "ollama-agents.gpu"
+
+# Image every agent container runs (built by the agent-base service in docker-compose.yml)
+AGENT_BASE_IMAGE = "ollama-agent-base:latest"
+
+# config.yml is rendered directly (no YAML emitter) when it fits this simple shape
+CONFIG_YML_MAX_CAPABILITIES = 100
+CONFIG_YML_KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+# Per-agent .env file written next to its compose file (filled via format_map)
+AGENT_ENV_TEMPLATE = """# ============================================================================
+# AGENT: {agent_name}
+# ============================================================================
+# {description}
+# This file contains environment-specific configuration for the agent.
+# ============================================================================
+
+# Port to expose the agent on
+PORT={port}
+
+# Ollama model to use (optional - defaults to DEFAULT_MODEL={default_model})
+# Uncomment to override the global default model
+{model_line}
+
+# Model temperature (optional - defaults to DEFAULT_TEMPERATURE={default_temp})
+# Uncomment to override: 0.0 = deterministic, 1.0 = creative
+{temp_line}
+
+# Maximum tokens to generate (optional - defaults to DEFAULT_MAX_TOKENS={default_tokens})
+# Uncomment to override
+{tokens_line}
+
+# Ollama host URL (optional - defaults to OLLAMA_HOST from main .env)
+# Uncomment to override for this specific agent
+{ollama_host_line}
+
+# Agent name (used for logging and identification)
+AGENT_NAME={agent_name}
+"""
+
+# plugin.yml written per agent. Variable fields are filled with JSON-encoded values
+# (valid YAML flow scalars/sequences), so no YAML emitter runs per deploy
+PLUGIN_YML_TEMPLATE = """plugin:
+  id: {id}
+  name: {name}
+  description: {description}
+  version: {version}
+  author: User
+  tags: {tags}
+  icon: "\\U0001F50C"
+agent:
+  port: {port}
+  model: {model}
+  temperature: {temperature}
+  max_tokens: {max_tokens}
+  resources:
+    memory: 512M
+    cpu: '1.0'
+capabilities: {capabilities}
+api:
+  endpoint: /process
+  input:
+    type: text
+    format: text
+    description: Input text to process
+  output:
+    type: text
+    format: text
+    description: Processed output
+requires:
+  ollama: '>=0.1.0'
+  models: {models}
+health:
+  endpoint: /health
+  interval: 30s
+  timeout: 10s
+  retries: 3
+"""
+
+# Standalone compose file written per agent (filled via format_map; {{ }} are literal braces)
+AGENT_COMPOSE_TEMPLATE = """# ==========================================================================
+# AGENT: {agent_title}
+# ==========================================================================
+# {description}
+# Endpoint: http://localhost:{port}/process
+# Auto-generated - do not edit manually
+# ==========================================================================
+
+services:
+  {agent_name}:
+    image: {base_image}
+    container_name: agent-{agent_name}
+    restart: unless-stopped
+    env_file:
+      - runtime/compose/.env.{agent_name}
+    environment:
+      - AGENT_DATA_DIR=/app/runtime/agents/{agent_name}
+      - CONTEXT_DIR=/app/runtime/context/{agent_name}
+      # Pass through global defaults from main .env
+      - DEFAULT_MODEL=${{DEFAULT_MODEL:-llama3.2}}
+      - DEFAULT_TEMPERATURE=${{DEFAULT_TEMPERATURE:-0.7}}
+      - DEFAULT_MAX_TOKENS=${{DEFAULT_MAX_TOKENS:-4096}}
+      - OLLAMA_HOST=${{OLLAMA_HOST:-http://ollama:11434}}
+    ports:
+      - "{port}:8000"
+    volumes:
+      # Mount the runtime directory to access agent config, prompt and context
+      - ./runtime:/app/runtime
+    networks:
+      - agent-network
+    healthcheck:
+      test: [ "CMD", "curl", "-f", "http://localhost:8000/health" ]
+      interval: 30s
+      timeout: 10s
+      retries: 3
+      start_period: 20s
+
+networks:
+  agent-network:
+    external: true
+    name: ${{DOCKER_NETWORK_NAME:-ollama-agent-network}}
+"""
+
+# Docker client shared by every DeploymentManager (created on first use)
+_docker_client = None
+_docker_client_lock = threading.Lock()
+
+# Container project root -> detected host path (only successful detections are kept)
+_host_project_roots: Dict[Path, Path] = {}
+
+
+def _yaml_scalar(value: Any) -> Optional[str]:
+    """Encode a plain scalar as a YAML flow scalar (JSON subset), or None if it isn't one"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        encoded = json.dumps(value, ensure_ascii=False)
+        # YAML 1.1 only reads numbers with a '.' as floats: JSON's 1e-05 would load as a string
+        if isinstance(value, float) and "." not in encoded:
+            return None
+        return encoded
+    return None
+
+
+def _yaml_flow(value: Any) -> str:
+    """Encode a scalar or list as a one-line YAML flow node, using the emitter when JSON won't read back the same"""
+    if isinstance(value, list):
+        items = [_yaml_scalar(item) for item in value]
+        if None not in items:
+            return "[" + ", ".join(items) + "]"
+    else:
+        encoded = _yaml_scalar(value)
+        if encoded is not None:
+            return encoded
+    return yaml.dump(value, Dumper=YamlDumper, default_flow_style=True, width=1 << 30).removesuffix("...\n").strip()
+
+
+def _render_config_yml(config_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Render an agent config.yml without the YAML emitter.
+
+    Args:
+        config_data: Dict with "agent", "capabilities" and "options" sections
+
+    Returns:
+        The YAML text, or None when the data has a shape the fast path doesn't
+        handle (nested values, unusual keys, very long lists)
+    """
+    capabilities = config_data["capabilities"]
+    if not isinstance(capabilities, list) or len(capabilities) >= CONFIG_YML_MAX_CAPABILITIES:
+        return None
+
+    def mapping_lines(mapping: Dict[str, Any]) -> Optional[List[str]]:
+        out = []
+        for key, value in mapping.items():
+            encoded = _yaml_scalar(value)
+            if encoded is None or not isinstance(key, str) or not CONFIG_YML_KEY_PATTERN.match(key):
+                return None
+            out.append(f"  {key}: {encoded}")
+        return out
+
+    agent_lines = mapping_lines(config_data["agent"])
+    options_lines = mapping_lines(config_data["options"])
+    capability_lines = [_yaml_scalar(capability) for capability in capabilities]
+    if agent_lines is None or options_lines is None or None in capability_lines:
+        return None
+
+    lines = ["agent:", *agent_lines]
+    if capability_lines:
+        lines.append("capabilities:")
+        lines.extend(f"- {encoded}" for encoded in capability_lines)
+    else:
+        lines.append("capabilities: []")
+    lines.append("options:")
+    lines.extend(options_lines)
+
+    return "\n".join(lines) + "\n"
+
+
+def _write_file(path: Path, content: str):
+    """Write a small text file with unbuffered os.write calls"""
+    data = memoryview(content.encode())
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _write_file_atomic(path: Path, content: str):
+    """
+    Write a file via a temp file + os.replace, so readers (docker compose) never
+    see a half-written file. The temp name is hidden from the *.yml compose glob.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        _write_file(tmp_path, content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_file_if_changed(path: Path, content: str, atomic: bool = False) -> bool:
+    """
+    Write a file only when its content differs from what is already on disk,
+    so idempotent redeploys don't rewrite identical files.
+
+    Args:
+        path: File to write
+        content: New file content
+        atomic: Write via _write_file_atomic instead of in place
+
+    Returns:
+        bool: True if the file was written
+    """
+    data = content.encode()
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+
+    (_write_file_atomic if atomic else _write_file)(path, content)
+    return True
+
+
+def _wait_for_files(paths: List[Path], timeout: float = 2.0, interval: float = 0.05):
+    """Poll until every path is a regular file, giving up after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while not all(path.is_file() for path in paths) and time.monotonic() < deadline:
+        time.sleep(interval)
+
+
+# syncfs(2) flushes one filesystem in a single call (Linux only)
+try:
+    _syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+except (OSError, AttributeError):
+    _syncfs = None
+
+
+def _sync_to_disk(paths: List[Path]):
+    """
+    Flush freshly written files to disk with one barrier per filesystem.
+
+    Uses syncfs(2) where available and falls back to an fsync per file.
+    """
+    synced_devices = set()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            device = os.fstat(fd).st_dev
+            if _syncfs and device in synced_devices:
+                continue
+            if _syncfs and _syncfs(fd) == 0:
+                synced_devices.add(device)
+                continue
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _get_docker_client() -> docker.DockerClient:
+    """Return the shared Docker client, connecting on first call"""
+    global _docker_client
+    if _docker_client is None:
+        with _docker_client_lock:
+            if _docker_client is None:
+                _docker_client = docker.from_env(timeout=DOCKER_CLIENT_TIMEOUT)
+    return _docker_client
 
 
 class DeploymentManager:
@@ -24,13 +346,12 @@ class DeploymentManager:
 
         # Initialize Docker client first (needed for auto-detection)
         try:
-            self.docker_client = docker.from_env()
+            self.docker_client = _get_docker_client()
         except Exception as e:
             print(f"Warning: Could not connect to Docker: {e}")
             self.docker_client = None
 
         # Get host filesystem path for Docker mounts (with auto-detection)
-        import os
         self.host_project_root = self._detect_host_project_root(project_root)
 
         self.docker_compose_path = self.project_root / "docker-compose.yml"
@@ -44,6 +365,21 @@ class DeploymentManager:
 
         self.env_path = self.project_root / ".env"
 
+        # Flush deploy files to disk before starting the container (opt-in, see module docstring)
+        self._fsync_enabled = os.getenv("AGENT_DEPLOY_FSYNC", "0") == "1"
+
+        # (agent_name, include_gpu) -> (directory mtimes, compose file arguments)
+        self._compose_files_cache: Dict[tuple, tuple] = {}
+
+        # Set once the agent base image is known to exist locally
+        self._base_image_ready = False
+
+        # (monotonic timestamp, gpu mode) of the last successful GPU detection
+        self._gpu_mode_cache: Optional[tuple] = None
+
+        # (monotonic timestamp, {container name: state}) of the last agent container listing
+        self._container_states_cache: Optional[tuple] = None
+
     def _detect_host_project_root(self, project_root: Path) -> Path:
         """
         Auto-detect the host filesystem path for the project.
@@ -57,19 +393,25 @@ class DeploymentManager:
         2. If not set, try to auto-detect by inspecting our own container
         3. Fall back to project_root if detection fails
 
+        Paths found by strategy 1 or 2 are remembered for the process lifetime,
+        so later managers skip the container inspect.
+
         Args:
             project_root: The project root path inside the container
 
         Returns:
             Path: The absolute path on the host machine
         """
-        import os
+        cached = _host_project_roots.get(Path(project_root))
+        if cached:
+            return cached
 
         # Strategy 1: Use HOST_PROJECT_ROOT if explicitly set
         env_value = os.getenv("HOST_PROJECT_ROOT")
         if env_value and env_value.strip():
             detected_path = Path(env_value)
             print(f"✓ Using HOST_PROJECT_ROOT from environment: {detected_path}")
+            _host_project_roots[Path(project_root)] = detected_path
             return detected_path
 
         # Strategy 2: Auto-detect by inspecting our own container
@@ -88,6 +430,7 @@ class DeploymentManager:
                         if source:
                             detected_path = Path(source)
                             print(f"✓ Auto-detected host path from container mount: {detected_path}")
+                            _host_project_roots[Path(project_root)] = detected_path
                             return detected_path
         except Exception as e:
             print(f"Warning: Could not auto-detect host path from container: {e}")
@@ -111,6 +454,14 @@ class DeploymentManager:
         Returns:
             list: List of compose file arguments for docker compose command
         """
+        # Adding/removing a compose file changes its directory's mtime, so the
+        # listing only needs to be rebuilt when one of the two directories changes
+        cache_key = (agent_name, include_gpu)
+        mtimes = (self.project_root.stat().st_mtime_ns, self.agents_compose_dir.stat().st_mtime_ns)
+        cached = self._compose_files_cache.get(cache_key)
+        if cached and cached[0] == mtimes:
+            return list(cached[1])
+
         # Use container paths - docker compose runs inside the container
         files = ["-f", str(self.docker_compose_path)]
 
@@ -134,6 +485,7 @@ class DeploymentManager:
             if gpu_compose.exists():
                 files.extend(["-f", str(gpu_compose)])
 
+        self._compose_files_cache[cache_key] = (mtimes, tuple(files))
         return files
 
     def _write_agent_env_file(self, agent_name: str, agent_definition: Dict[str, Any]) -> Path:
@@ -179,41 +531,21 @@ class DeploymentManager:
         default_host = os.getenv("OLLAMA_HOST", "http://ollama:11434")
         ollama_host_line = f"OLLAMA_HOST={ollama_host}" if ollama_host != default_host else f"# OLLAMA_HOST={ollama_host}"
 
-        env_content = f'''# ============================================================================
-# AGENT: {agent_name}
-# ============================================================================
-# {description}
-# This file contains environment-specific configuration for the agent.
-# ============================================================================
-
-# Port to expose the agent on
-PORT={port}
-
-# Ollama model to use (optional - defaults to DEFAULT_MODEL={default_model})
-# Uncomment to override the global default model
-{model_line}
-
-# Model temperature (optional - defaults to DEFAULT_TEMPERATURE={default_temp})
-# Uncomment to override: 0.0 = deterministic, 1.0 = creative
-{temp_line}
-
-# Maximum tokens to generate (optional - defaults to DEFAULT_MAX_TOKENS={default_tokens})
-# Uncomment to override
-{tokens_line}
-
-# Ollama host URL (optional - defaults to OLLAMA_HOST from main .env)
-# Uncomment to override for this specific agent
-{ollama_host_line}
-
-# Agent name (used for logging and identification)
-AGENT_NAME={agent_name}
-'''
+        env_content = AGENT_ENV_TEMPLATE.format_map({
+            "agent_name": agent_name,
+            "description": description,
+            "port": port,
+            "default_model": default_model,
+            "default_temp": default_temp,
+            "default_tokens": default_tokens,
+            "model_line": model_line,
+            "temp_line": temp_line,
+            "tokens_line": tokens_line,
+            "ollama_host_line": ollama_host_line,
+        })
 
         env_path = self.agents_compose_dir / f".env.{agent_name}"
-        with open(env_path, "w") as f:
-            f.write(env_content)
-            f.flush()
-            os.fsync(f.fileno())  # Force write to disk
+        _write_file_if_changed(env_path, env_content, atomic=True)
 
         return env_path
 
@@ -238,85 +570,114 @@ AGENT_NAME={agent_name}
         # In Prod: they are standard Docker volumes
         
         # The agent service will use the pre-built base image
-        compose_content = f'''# ==========================================================================
-# AGENT: {agent_name.upper()}
-# ==========================================================================
-# {description}
-# Endpoint: http://localhost:{port}/process
-# Auto-generated - do not edit manually
-# ==========================================================================
-
-services:
-  {agent_name}:
-    image: ollama-agent-base:latest
-    container_name: agent-{agent_name}
-    restart: unless-stopped
-    env_file:
-      - runtime/compose/.env.{agent_name}
-    environment:
-      - AGENT_DATA_DIR=/app/runtime/agents/{agent_name}
-      - CONTEXT_DIR=/app/runtime/context/{agent_name}
-      # Pass through global defaults from main .env
-      - DEFAULT_MODEL=${{DEFAULT_MODEL:-llama3.2}}
-      - DEFAULT_TEMPERATURE=${{DEFAULT_TEMPERATURE:-0.7}}
-      - DEFAULT_MAX_TOKENS=${{DEFAULT_MAX_TOKENS:-4096}}
-      - OLLAMA_HOST=${{OLLAMA_HOST:-http://ollama:11434}}
-    ports:
-      - "{port}:8000"
-    volumes:
-      # Mount the runtime directory to access agent config, prompt and context
-      - ./runtime:/app/runtime
-    networks:
-      - agent-network
-    healthcheck:
-      test: [ "CMD", "curl", "-f", "http://localhost:8000/health" ]
-      interval: 30s
-      timeout: 10s
-      retries: 3
-      start_period: 20s
-
-networks:
-  agent-network:
-    external: true
-    name: ${{DOCKER_NETWORK_NAME:-ollama-agent-network}}
-'''
+        compose_content = AGENT_COMPOSE_TEMPLATE.format_map({
+            "agent_name": agent_name,
+            "agent_title": agent_name.upper(),
+            "base_image": AGENT_BASE_IMAGE,
+            "description": description,
+            "port": port,
+        })
 
         compose_path = self.agents_compose_dir / f"{agent_name}.yml"
-        with open(compose_path, "w") as f:
-            f.write(compose_content)
+
+        # Redeploys usually render identical content; the file is only rewritten when it differs
+        _write_file_if_changed(compose_path, compose_content, atomic=True)
 
         return compose_path
 
-    def detect_gpu_mode(self) -> bool:
+    def detect_gpu_mode(self, refresh: bool = False) -> bool:
         """
         Detect if the project was started with GPU support.
-        Checks for gpu-specific compose file or NVIDIA runtime.
+        Checks the GPU label on the Ollama container (falling back to its NVIDIA
+        runtime / device requests when the label is absent) or the gpu compose file.
+
+        The result is cached for GPU_MODE_CACHE_TTL seconds since the GPU setup
+        only changes when the stack is restarted.
+
+        Args:
+            refresh: Ignore the cached result and inspect Docker again
         """
         if not self.docker_client:
             return False
 
+        if not refresh and self._gpu_mode_cache:
+            checked_at, gpu_mode = self._gpu_mode_cache
+            if time.monotonic() - checked_at < GPU_MODE_CACHE_TTL:
+                return gpu_mode
+
         try:
-            # Check if ollama container is using GPU
-            try:
-                container = self.docker_client.containers.get("ollama-engine")
-                # Check for NVIDIA runtime or device requests
-                config = container.attrs.get("HostConfig", {})
-                runtime = config.get("Runtime", "")
-                device_requests = config.get("DeviceRequests", [])
-
-                if runtime == "nvidia" or device_requests:
-                    return True
-            except docker.errors.NotFound:
-                pass
-
-            # Check if docker-compose.gpu.yml exists
-            gpu_compose = self.project_root / "docker-compose.gpu.yml"
-            return gpu_compose.exists()
+            # Check if ollama container is using GPU; the list summary carries labels
+            # without a full inspect
+            containers = self.docker_client.api.containers(all=True, filters={"name": "^/ollama-engine$"})
+            if containers:
+                labels = containers[0].get("Labels") or {}
+                if GPU_LABEL in labels:
+                    # An explicit label wins, including "false" for CPU mode
+                    gpu_mode = labels[GPU_LABEL] == "true"
+                else:
+                    # Container created before the label existed: check for NVIDIA runtime or device requests
+                    config = self.docker_client.api.inspect_container(containers[0]["Id"]).get("HostConfig", {})
+                    runtime = config.get("Runtime", "")
+                    device_requests = config.get("DeviceRequests", [])
+
+                    gpu_mode = runtime == "nvidia" or bool(device_requests)
+            else:
+                # No ollama container yet: assume GPU mode if docker-compose.gpu.yml exists
+                gpu_compose = self.project_root / "docker-compose.gpu.yml"
+                gpu_mode = gpu_compose.exists()
+
+            self._gpu_mode_cache = (time.monotonic(), gpu_mode)
+            return gpu_mode
 
         except Exception as e:
             print(f"GPU detection error: {e}")
             return False
 
+    def _ensure_base_image(self):
+        """
+        Make sure the agent base image exists before starting agent containers.
+
+        Agents share one prebuilt image, so it is built (via the agent-base compose
+        service) at most once; later deploys only pay for the first local lookup.
+        """
+        if self._base_image_ready:
+            return
+
+        try:
+            self.docker_client.images.get(AGENT_BASE_IMAGE)
+        except docker.errors.ImageNotFound:
+            print(f"⏳ Building {AGENT_BASE_IMAGE} (first deploy)...")
+            build_cmd = ["docker", "compose", "-p", "ollama-agents", "-f", str(self.docker_compose_path), "build", "agent-base"]
+            subprocess.run(build_cmd, cwd=str(self.project_root), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        self._base_image_ready = True
+
+    def _container_states(self) -> Dict[str, str]:
+        """
+        Map agent container names to their state from a single listing.
+
+        One low-level list call replaces a containers.get() per agent; the result
+        is reused for CONTAINER_STATUS_CACHE_TTL seconds.
+        """
+        if self._container_states_cache:
+            listed_at, states = self._container_states_cache
+            if time.monotonic() - listed_at < CONTAINER_STATUS_CACHE_TTL:
+                return states
+
+        # Low-level API: containers.list() inspects every container and fails on "ghost" ones
+        containers = self.docker_client.api.containers(all=True, filters={"name": "agent-"})
+        states = {}
+        for container in containers:
+            for name in container.get("Names", []):
+                states[name.lstrip("/")] = container.get("State", "unknown")
+
+        self._container_states_cache = (time.monotonic(), states)
+        return states
+
+    def _invalidate_container_states(self):
+        """Drop the cached container listing after an operation that changes it"""
+        self._container_states_cache = None
+
     def create_agent_files(self, agent_definition: Dict[str, Any]) -> bool:
         """
         Create agent directory structure and configuration files.
@@ -352,10 +713,10 @@ networks:
             }
 
             config_file = agent_dir / "config.yml"
-            with open(config_file, "w") as f:
-                yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
+            config_yml = _render_config_yml(config_data)
+            if config_yml is None:
+                config_yml = yaml.dump(config_data, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+            _write_file_if_changed(config_file, config_yml)
 
             # Verify config.yml was created and is a file
             if not config_file.is_file():
@@ -363,67 +724,32 @@ networks:
 
             # Create prompt.txt
             prompt_file = agent_dir / "prompt.txt"
-            with open(prompt_file, "w") as f:
-                f.write(agent_definition["system_prompt"])
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
+            _write_file_if_changed(prompt_file, agent_definition["system_prompt"])
 
             # Verify prompt.txt was created and is a file
             if not prompt_file.is_file():
                 raise Exception(f"Failed to create prompt.txt as a file at {prompt_file}")
 
             # Create plugin.yml
-            plugin_data = {
-                "plugin": {
-                    "id": agent_name,
-                    "name": agent_definition["agent"]["description"],
-                    "description": agent_definition["agent"]["description"],
-                    "version": agent_definition["agent"].get("version", "1.0.0"),
-                    "author": "User",
-                    "tags": agent_definition.get("capabilities", [])[:3],
-                    "icon": "🔌"
-                },
-                "agent": {
-                    "port": agent_definition["deployment"]["port"],
-                    "model": agent_definition["deployment"]["model"],
-                    "temperature": agent_definition["deployment"]["temperature"],
-                    "max_tokens": agent_definition["deployment"]["max_tokens"],
-                    "resources": {
-                        "memory": "512M",
-                        "cpu": "1.0"
-                    }
-                },
-                "capabilities": agent_definition.get("capabilities", []),
-                "api": {
-                    "endpoint": "/process",
-                    "input": {
-                        "type": "text",
-                        "format": "text",
-                        "description": "Input text to process"
-                    },
-                    "output": {
-                        "type": "text",
-                        "format": "text",
-                        "description": "Processed output"
-                    }
-                },
-                "requires": {
-                    "ollama": ">=0.1.0",
-                    "models": [agent_definition["deployment"]["model"]]
-                },
-                "health": {
-                    "endpoint": "/health",
-                    "interval": "30s",
-                    "timeout": "10s",
-                    "retries": 3
-                }
+            capabilities = agent_definition.get("capabilities", [])
+            plugin_fields = {
+                "id": agent_name,
+                "name": agent_definition["agent"]["description"],
+                "description": agent_definition["agent"]["description"],
+                "version": agent_definition["agent"].get("version", "1.0.0"),
+                "tags": capabilities[:3],
+                "port": agent_definition["deployment"]["port"],
+                "model": agent_definition["deployment"]["model"],
+                "temperature": agent_definition["deployment"]["temperature"],
+                "max_tokens": agent_definition["deployment"]["max_tokens"],
+                "capabilities": capabilities,
+                "models": [agent_definition["deployment"]["model"]],
             }
 
             plugin_file = agent_dir / "plugin.yml"
-            with open(plugin_file, "w") as f:
-                yaml.dump(plugin_data, f, default_flow_style=False, sort_keys=False)
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
+            _write_file_if_changed(plugin_file, PLUGIN_YML_TEMPLATE.format_map({
+                key: _yaml_flow(value) for key, value in plugin_fields.items()
+            }))
 
             # Verify plugin.yml was created and is a file
             if not plugin_file.is_file():
@@ -502,6 +828,14 @@ networks:
         }
 
         try:
+            # GPU detection is a Docker daemon round-trip with no dependency on the
+            # agent files, so run it while the files are being written
+            gpu_future = None
+            if self.docker_client:
+                executor = ThreadPoolExecutor(max_workers=1)
+                gpu_future = executor.submit(self.detect_gpu_mode)
+                executor.shutdown(wait=False)
+
             # Step 1: Create agent files
             result["steps"].append({"step": "create_files", "status": "running"})
             if not self.create_agent_files(agent_definition):
@@ -523,33 +857,37 @@ networks:
                 return result
             result["steps"][-1]["status"] = "completed"
 
+            # Single disk barrier for everything written above (instead of an fsync per file)
+            if self._fsync_enabled:
+                agent_dir = self.agents_dir / agent_name
+                _sync_to_disk([
+                    agent_dir / "config.yml",
+                    agent_dir / "prompt.txt",
+                    agent_dir / "plugin.yml",
+                    self.agents_compose_dir / f".env.{agent_name}",
+                    self.agents_compose_dir / f"{agent_name}.yml",
+                ])
+
             # Step 4: Build and start container
             if self.docker_client:
                 result["steps"].append({"step": "build_container", "status": "running"})
 
-                # Small delay to ensure filesystem has synced (especially important in containers)
-                import time
-                print("⏳ Waiting for filesystem to sync...")
-                time.sleep(2)
+                # Wait until the agent files are visible (bind-mount propagation is
+                # usually immediate) instead of a fixed delay
+                agent_dir = self.agents_dir / agent_name
+                required_files = ["config.yml", "prompt.txt", "plugin.yml"]
+                _wait_for_files([agent_dir / filename for filename in required_files])
 
-                # Detect GPU mode
-                gpu_mode = self.detect_gpu_mode()
+                # Detect GPU mode (started before the file steps)
+                gpu_mode = gpu_future.result()
+
+                # Agent services reference the base image instead of building one each
+                self._ensure_base_image()
 
                 # Get compose files for this specific agent
                 compose_files = self.get_compose_files(agent_name=agent_name, include_gpu=gpu_mode)
 
-                # Remove existing container if it exists (to avoid mount issues)
-                try:
-                    rm_cmd = ["docker", "compose", "-p", "ollama-agents"] + compose_files + ["rm", "-f", "-s", "-v", agent_name]
-                    subprocess.run(rm_cmd, cwd=str(self.project_root), check=False, capture_output=True)
-                except Exception:
-                    pass  # Ignore if container doesn't exist
-
                 # Verify files exist on host before starting container
-                agent_dir = self.agents_dir / agent_name
-                host_agent_dir = self.host_project_root / "runtime" / "agents" / agent_name
-                required_files = ["config.yml", "prompt.txt", "plugin.yml"]
-
                 print(f"🔍 Verifying files exist before container start...")
                 for filename in required_files:
                     file_path = agent_dir / filename
@@ -557,10 +895,12 @@ networks:
                         raise Exception(f"Required file missing before container start: {file_path}")
                     print(f"  ✓ {filename} exists")
 
-                # Start the service with force-recreate to avoid mount issues
+                # Start the service in a single compose call: --force-recreate replaces any existing
+                # container and --renew-anon-volumes drops its anonymous volumes (avoids mount issues)
                 result["steps"].append({"step": "start_container", "status": "running"})
-                up_cmd = ["docker", "compose", "-p", "ollama-agents"] + compose_files + ["up", "-d", "--force-recreate", agent_name]
-                subprocess.run(up_cmd, cwd=str(self.project_root), check=True, capture_output=True)
+                up_cmd = ["docker", "compose", "-p", "ollama-agents"] + compose_files + ["up", "-d", "--force-recreate", "--renew-anon-volumes", agent_name]
+                subprocess.run(up_cmd, cwd=str(self.project_root), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                self._invalidate_container_states()
                 result["steps"][-1]["status"] = "completed"
 
                 # Deploy completed
@@ -596,6 +936,25 @@ networks:
 
         return result
 
+    def deploy_agents(self, agent_definitions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Deploy several agents concurrently (each deploy mostly waits on Docker).
+
+        Args:
+            agent_definitions: Agent configurations to deploy
+
+        Returns:
+            list: Deployment results, in the same order as agent_definitions
+        """
+        if not agent_definitions:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(DEPLOY_WORKERS, len(agent_definitions))) as executor:
+            return list(executor.map(
+                lambda definition: self.deploy_agent(definition["agent"]["name"], definition),
+                agent_definitions
+            ))
+
     def get_agent_status(self, agent_name: str) -> Dict[str, Any]:
         """
         Get the deployment status of an agent.
@@ -606,41 +965,76 @@ networks:
         Returns:
             dict: Status information
         """
-        status = {
-            "agent_name": agent_name,
-            "files_exist": False,
-            "in_compose": False,
-            "in_env": False,
-            "container_status": "not_found",
-            "healthy": False
-        }
-
         try:
             # Check if files exist
             agent_dir = self.agents_dir / agent_name
-            status["files_exist"] = agent_dir.exists() and (agent_dir / "prompt.txt").exists()
+            files_exist = agent_dir.exists() and (agent_dir / "prompt.txt").exists()
 
             # Check if compose file exists
             compose_path = self.agents_compose_dir / f"{agent_name}.yml"
-            status["in_compose"] = compose_path.exists()
+            in_compose = compose_path.exists()
+
+            # The per-agent .env file is the agent's env configuration
+            in_env = (self.agents_compose_dir / f".env.{agent_name}").is_file()
+        except Exception as e:
+            return {**self._build_status(agent_name, False, False, False), "error": str(e)}
+
+        return self._build_status(agent_name, files_exist, in_compose, in_env)
+
+    def list_agent_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the deployment status of every agent with runtime files or a compose file.
+
+        Scans the agents and compose directories once instead of stat-ing each agent.
+
+        Returns:
+            dict: agent name -> status information (same shape as get_agent_status)
+        """
+        try:
+            with os.scandir(self.agents_dir) as it:
+                agent_dirs = {entry.name for entry in it if entry.is_dir()}
+        except FileNotFoundError:
+            agent_dirs = set()
 
-            # Check if in .env
-            if self.env_path.exists():
-                with open(self.env_path, "r") as f:
-                    content = f.read()
-                    env_prefix = agent_name.upper().replace("-", "_")
-                    status["in_env"] = f"{env_prefix}_PORT" in content
+        compose_agents = set()
+        env_agents = set()
+        try:
+            with os.scandir(self.agents_compose_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    if entry.name.startswith(".env."):
+                        env_agents.add(entry.name[len(".env."):])
+                    elif entry.name.endswith(".yml") and not entry.name.startswith("."):
+                        compose_agents.add(entry.name[:-len(".yml")])
+        except FileNotFoundError:
+            pass
+
+        statuses = {}
+        for agent_name in sorted(agent_dirs | compose_agents):
+            files_exist = agent_name in agent_dirs and (self.agents_dir / agent_name / "prompt.txt").is_file()
+            statuses[agent_name] = self._build_status(
+                agent_name, files_exist, agent_name in compose_agents, agent_name in env_agents
+            )
+        return statuses
+
+    def _build_status(self, agent_name: str, files_exist: bool, in_compose: bool, in_env: bool) -> Dict[str, Any]:
+        """Assemble an agent status dict; container state comes from the shared listing cache"""
+        status = {
+            "agent_name": agent_name,
+            "files_exist": files_exist,
+            "in_compose": in_compose,
+            "in_env": in_env,
+            "container_status": "not_found",
+            "healthy": False
+        }
 
+        try:
             # Check container status
             if self.docker_client:
-                try:
-                    container_name = f"agent-{agent_name}"
-                    container = self.docker_client.containers.get(container_name)
-                    status["container_status"] = container.status
-                    status["healthy"] = container.status == "running"
-                except docker.errors.NotFound:
-                    status["container_status"] = "not_found"
-
+                container_status = self._container_states().get(f"agent-{agent_name}", "not_found")
+                status["container_status"] = container_status
+                status["healthy"] = container_status == "running"
         except Exception as e:
             status["error"] = str(e)
 
@@ -663,6 +1057,7 @@ networks:
             container_name = f"agent-{agent_name}"
             container = self.docker_client.containers.get(container_name)
             container.restart()
+            self._invalidate_container_states()
 
             return {
                 "status": "success",
@@ -690,6 +1085,7 @@ networks:
             container_name = f"agent-{agent_name}"
             container = self.docker_client.containers.get(container_name)
             container.stop()
+            self._invalidate_container_states()
 
             return {
                 "status": "success",
@@ -723,6 +1119,14 @@ networks:
                     "message": f"Agent compose file not found. Please deploy the agent first."
                 }
 
+            # Fast path: restart the stopped container through the SDK when its
+            # compose/.env configuration has not changed since it was created
+            if self._start_existing_container(agent_name, compose_path):
+                return {
+                    "status": "success",
+                    "message": f"Agent {agent_name} started successfully"
+                }
+
             # Detect GPU mode
             gpu_mode = self.detect_gpu_mode()
 
@@ -730,9 +1134,9 @@ networks:
             compose_files = self.get_compose_files(agent_name=agent_name, include_gpu=gpu_mode)
 
             # Start the service using docker-compose (use same project name and force-recreate)
-            import subprocess
             up_cmd = ["docker", "compose", "-p", "ollama-agents"] + compose_files + ["up", "-d", "--force-recreate", agent_name]
-            result = subprocess.run(up_cmd, cwd=str(self.project_root), check=True, capture_output=True)
+            subprocess.run(up_cmd, cwd=str(self.project_root), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            self._invalidate_container_states()
 
             return {
                 "status": "success",
@@ -744,6 +1148,44 @@ networks:
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _start_existing_container(self, agent_name: str, compose_path: Path) -> bool:
+        """
+        Start an agent's stopped container in-process, skipping the compose CLI.
+
+        Only used when the container was created after the agent's compose and
+        .env files were last written, so recreating it would change nothing.
+
+        Args:
+            agent_name: Name of the agent
+            compose_path: The agent's compose file
+
+        Returns:
+            bool: True if the container was started, False if compose is needed
+        """
+        try:
+            container = self.docker_client.containers.get(f"agent-{agent_name}")
+        except docker.errors.NotFound:
+            return False
+
+        if container.status not in ("created", "exited"):
+            return False
+
+        # Docker reports e.g. 2024-05-01T10:20:30.123456789Z; second precision is enough here
+        created = datetime.strptime(container.attrs["Created"][:19], "%Y-%m-%dT%H:%M:%S")
+        created_ts = created.replace(tzinfo=timezone.utc).timestamp()
+
+        env_path = self.agents_compose_dir / f".env.{agent_name}"
+        config_mtime = max(
+            compose_path.stat().st_mtime,
+            env_path.stat().st_mtime if env_path.exists() else 0
+        )
+        if config_mtime >= created_ts:
+            return False
+
+        container.start()
+        self._invalidate_container_states()
+        return True
+
     def delete_agent(self, agent_name: str, remove_files: bool = True) -> Dict[str, Any]:
         """
         Completely delete an agent: stop container, remove snippet, refresh compose, and optionally delete files.
@@ -755,14 +1197,14 @@ networks:
         }
 
         try:
-            # Step 1: Stop and remove container (if exists)
+            # Step 1: Stop and remove container (if exists). A forced remove kills and
+            # removes in one daemon call; a graceful stop is pointless when deleting.
             if self.docker_client:
                 result["steps"].append({"step": "stop_container", "status": "running"})
                 container_name = f"agent-{agent_name}"
                 try:
-                    container = self.docker_client.containers.get(container_name)
-                    container.stop(timeout=10)
-                    container.remove(force=True)
+                    self.docker_client.api.remove_container(container_name, force=True)
+                    self._invalidate_container_states()
                     result["steps"][-1]["status"] = "completed"
                 except docker.errors.NotFound:
                     result["steps"][-1]["status"] = "skipped"
@@ -774,8 +1216,7 @@ networks:
             result["steps"].append({"step": "remove_compose_file", "status": "running"})
             compose_path = self.agents_compose_dir / f"{agent_name}.yml"
             try:
-                if compose_path.exists():
-                    compose_path.unlink()
+                compose_path.unlink(missing_ok=True)
                 result["steps"][-1]["status"] = "completed"
             except Exception as e:
                 result["errors"].append(f"Failed to remove compose file: {str(e)}")
@@ -785,8 +1226,7 @@ networks:
             result["steps"].append({"step": "remove_env_file", "status": "running"})
             env_path = self.agents_compose_dir / f".env.{agent_name}"
             try:
-                if env_path.exists():
-                    env_path.unlink()
+                env_path.unlink(missing_ok=True)
                 result["steps"][-1]["status"] = "completed"
             except Exception as e:
                 result["errors"].append(f"Failed to remove .env file: {str(e)}")
@@ -5,17 +5,82 @@ Executes multi-agent workflows defined in YAML configuration files.
 """
 
 import httpx
+import orjson
 import yaml
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Mapping
 from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import functools
 import asyncio
-import json
+import hashlib
+import os
+import random
+import time
+import uuid
+from contextvars import ContextVar
+
+# Prefer the LibYAML-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+# Keep a JSON copy of each parsed workflow (.<name>.yml.json) and load it instead of the
+# YAML while it is at least as new. Meant for deployments whose workflow files rarely change.
+WORKFLOW_JSON_CACHE = os.getenv("WORKFLOW_JSON_CACHE", "0") == "1"
+
+# Worker threads used to read and parse workflow files when listing them
+WORKFLOW_LOAD_WORKERS = 8
+
+# Step retries back off exponentially from RETRY_BACKOFF_BASE seconds, capped at
+# RETRY_BACKOFF_CAP, with random jitter so retries from concurrent runs don't align
+RETRY_BACKOFF_BASE = 2.0
+RETRY_BACKOFF_CAP = 60.0
+
+# Client errors that are worth retrying (timeouts, rate limiting); other 4xx stop retries
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+
+# Agents that don't accept a connection within AGENT_CONNECT_TIMEOUT seconds fail fast
+# instead of holding a step for the whole read timeout; failed connects are retried
+# AGENT_CONNECT_RETRIES times (nothing was sent yet, so this is safe for POSTs)
+AGENT_CONNECT_TIMEOUT = float(os.getenv("AGENT_CONNECT_TIMEOUT", "5.0"))
+AGENT_CONNECT_RETRIES = int(os.getenv("AGENT_CONNECT_RETRIES", "2"))
+
+# Negotiate HTTP/2 with agents, multiplexing concurrent calls over one connection per host.
+# Only applies to https:// agents behind an HTTP/2-capable gateway; needs httpx[http2]
+AGENT_HTTP2 = os.getenv("AGENT_HTTP2", "0") == "1"
+if AGENT_HTTP2:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("⚠ AGENT_HTTP2 is set but the h2 package is not installed - using HTTP/1.1")
+        AGENT_HTTP2 = False
+
+# Kinds of step input, resolved once from the step's `input` setting
+INPUT_PREVIOUS = "previous"
+INPUT_ORIGINAL = "original"
+INPUT_STEP = "step"
+INPUT_LITERAL = "literal"
+
+# Seconds a discover_agents() result is reused before agents are probed again
+DISCOVERY_CACHE_TTL = float(os.getenv("DISCOVERY_CACHE_TTL", "5.0"))
+
+# Successful agent replies kept per (agent URL, input) so identical calls skip the model.
+# Off by default: only worthwhile for deterministic agents (low temperature)
+AGENT_RESULT_CACHE_SIZE = int(os.getenv("AGENT_RESULT_CACHE_SIZE", "0"))
 
 
 class WorkflowStep:
     """Represents a single step in a workflow"""
 
+    __slots__ = (
+        "name", "agent", "agent_url", "input_source", "transform", "condition", "timeout",
+        "retry", "on_error", "depends_on", "input_kind", "input_index", "input_literal",
+    )
+
     def __init__(self, config: Dict[str, Any]):
         self.name = config.get("name", "unnamed-step")
         self.agent = config.get("agent")
@@ -26,6 +91,40 @@ class WorkflowStep:
         self.timeout = config.get("timeout", 300)
         self.retry = config.get("retry", 0)
         self.on_error = config.get("on_error", "stop")  # 'stop', 'continue', 'skip'
+        self.depends_on = config.get("depends_on")  # Optional step names/indices; inferred from input otherwise
+        self.input_kind, self.input_index, self.input_literal = self._parse_input_source(self.input_source)
+
+    @staticmethod
+    def _parse_input_source(input_source: Any) -> tuple:
+        """
+        Resolve an input setting once, so running the step needs no string parsing
+
+        Returns:
+            (kind, step index or None, literal value or None)
+        """
+        if not isinstance(input_source, str):
+            # Assume it's a direct value
+            return INPUT_LITERAL, None, str(input_source)
+        if input_source == "original":
+            return INPUT_ORIGINAL, None, None
+        if input_source == "previous":
+            return INPUT_PREVIOUS, None, None
+        if input_source.startswith("step["):
+            # Reference a specific step by index, e.g., "step[0]"; unparsable -> original input
+            try:
+                return INPUT_STEP, int(input_source[5:-1]), None
+            except ValueError:
+                return INPUT_STEP, None, None
+        # Direct string value
+        return INPUT_LITERAL, None, input_source
+
+    def inferred_dependencies(self, index: int) -> List[int]:
+        """Indices of earlier steps whose output this step reads (from its input source)"""
+        if self.input_kind == INPUT_PREVIOUS:
+            return [index - 1] if index > 0 else []
+        if self.input_kind == INPUT_STEP and self.input_index is not None and 0 <= self.input_index < index:
+            return [self.input_index]
+        return []
 
     def __repr__(self):
         return f"WorkflowStep(name={self.name}, agent={self.agent})"
@@ -34,18 +133,65 @@ class WorkflowStep:
 class Workflow:
     """Represents a complete workflow definition"""
 
+    __slots__ = ("name", "description", "version", "steps", "metadata", "dependencies")
+
     def __init__(self, config: Dict[str, Any]):
         self.name = config.get("name", "unnamed-workflow")
         self.description = config.get("description", "")
         self.version = config.get("version", "1.0.0")
         self.steps = [WorkflowStep(step) for step in config.get("steps", [])]
         self.metadata = config.get("metadata", {})
+        self.dependencies = self._resolve_dependencies()
+
+    def _resolve_dependencies(self) -> List[List[int]]:
+        """
+        Resolve each step's dependencies to step indices.
+
+        Returns:
+            One sorted list of prerequisite step indices per step
+
+        Raises:
+            ValueError: If a step depends on an unknown step or the steps form a cycle
+        """
+        indices = {step.name: i for i, step in enumerate(self.steps)}
+        dependencies = []
+        for i, step in enumerate(self.steps):
+            if step.depends_on is None:
+                dependencies.append(step.inferred_dependencies(i))
+                continue
+
+            resolved = set()
+            for ref in ([step.depends_on] if isinstance(step.depends_on, (str, int)) else step.depends_on):
+                index = ref if isinstance(ref, int) else indices.get(ref)
+                if index is None or not 0 <= index < len(self.steps) or index == i:
+                    raise ValueError(f"Step '{step.name}' has an invalid dependency: {ref!r}")
+                resolved.add(index)
+            dependencies.append(sorted(resolved))
+
+        # Kahn's algorithm: every step must become ready at some point
+        indegree = [len(deps) for deps in dependencies]
+        successors = [[] for _ in self.steps]
+        for i, deps in enumerate(dependencies):
+            for dep in deps:
+                successors[dep].append(i)
+        ready = [i for i, degree in enumerate(indegree) if degree == 0]
+        visited = 0
+        while ready:
+            visited += 1
+            for successor in successors[ready.pop()]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    ready.append(successor)
+        if visited != len(self.steps):
+            raise ValueError(f"Workflow '{self.name}' has a dependency cycle between its steps")
+
+        return dependencies
 
     @classmethod
     def from_file(cls, filepath: Path) -> "Workflow":
         """Load workflow from YAML file"""
-        with open(filepath, "r") as f:
-            config = yaml.safe_load(f)
+        with open(filepath, "rb") as f:
+            config = yaml.load(f, Loader=YamlLoader)
         return cls(config)
 
     @classmethod
@@ -60,24 +206,66 @@ class Workflow:
 class WorkflowExecution:
     """Tracks the execution of a workflow"""
 
+    __slots__ = (
+        "workflow", "initial_input", "execution_id", "status", "current_step_index", "step_results",
+        "error", "start_time", "end_time", "_start_ns", "_end_ns", "_finished_dict",
+    )
+
     def __init__(self, workflow: Workflow, initial_input: str):
         self.workflow = workflow
         self.initial_input = initial_input
-        self.execution_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.status = "pending"  # pending, running, completed, failed
+        # Timestamp prefix keeps IDs readable; the random suffix avoids collisions within a second
+        self.execution_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.status = "pending"  # pending, running, completed, failed, cancelled
         self.current_step_index = -1
         self.step_results = []
         self.error = None
         self.start_time = None
         self.end_time = None
+        # Monotonic timestamps (ns) for the duration; wall-clock times are only for display
+        self._start_ns = None
+        self._end_ns = None
+        # Serialized form of a finished execution, keyed by the number of step results
+        # (a cancelled run may still record the step that was in flight)
+        self._finished_dict = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the execution reached a terminal state"""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def mark_started(self):
+        """Record the start of the run"""
+        self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+
+    def mark_finished(self):
+        """Record the end of the run (the status is set by the caller)"""
+        self.end_time = datetime.now()
+        self._end_ns = time.monotonic_ns()
+
+    def cancel(self):
+        """Mark the execution as cancelled (running steps stop at the next step boundary)"""
+        if not self.is_finished:
+            self.status = "cancelled"
+            self.error = "Execution cancelled"
+            self.mark_finished()
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert execution state to dictionary"""
+        """
+        Convert execution state to dictionary (cached once the execution is finished).
+        start_time/end_time stay datetimes; orjson (and FastAPI) encode them as ISO 8601.
+        """
+        if self._finished_dict and self._finished_dict[0] == len(self.step_results):
+            return self._finished_dict[1]
+
         duration = None
-        if self.start_time and self.end_time:
+        if self._start_ns is not None and self._end_ns is not None:
+            duration = (self._end_ns - self._start_ns) / 1e9
+        elif self.start_time and self.end_time:
             duration = (self.end_time - self.start_time).total_seconds()
 
-        return {
+        data = {
             "execution_id": self.execution_id,
             "workflow_name": self.workflow.name,
             "status": self.status,
@@ -86,62 +274,180 @@ class WorkflowExecution:
             "step_results": self.step_results,
             "error": self.error,
             "duration_seconds": duration,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
         }
 
+        if self.is_finished:
+            self._finished_dict = (len(self.step_results), data)
+        return data
+
+
+# Execution being run by the current task; lets helpers such as call_agent()
+# reach it without threading it through every signature or looking it up by ID
+current_execution: ContextVar[Optional[WorkflowExecution]] = ContextVar("current_execution", default=None)
+
+
+class ExecutionStore:
+    """
+    Bounded in-memory store for workflow executions.
+    Keeps insertion order so the most recent executions can be listed
+    without sorting, and evicts the oldest finished entries once max_size is
+    reached. Pending and running executions are never evicted, so the store
+    may temporarily hold more than max_size entries.
+    Only accessed from the event loop thread, so it needs no locking or sharding.
+    """
+
+    def __init__(self, max_size: int = 500):
+        self.max_size = max_size
+        self._executions: "OrderedDict[str, WorkflowExecution]" = OrderedDict()
+
+    def put(self, execution: WorkflowExecution):
+        """Store (or refresh) an execution as the most recent one"""
+        self._executions[execution.execution_id] = execution
+        self._executions.move_to_end(execution.execution_id)
+        excess = len(self._executions) - self.max_size
+        if excess > 0:
+            stale = list(islice((
+                execution_id for execution_id, stored in self._executions.items()
+                if stored.is_finished
+            ), excess))
+            for execution_id in stale:
+                del self._executions[execution_id]
+
+    def get(self, execution_id: str) -> Optional[WorkflowExecution]:
+        """Get an execution by ID"""
+        return self._executions.get(execution_id)
+
+    def recent(self, limit: int = 20) -> List[WorkflowExecution]:
+        """Return up to `limit` executions, newest first"""
+        if limit <= 0:
+            return []
+        return list(islice(reversed(self._executions.values()), limit))
+
+    def __contains__(self, execution_id: str) -> bool:
+        return execution_id in self._executions
+
+    def __len__(self) -> int:
+        return len(self._executions)
+
 
 class WorkflowOrchestrator:
     """Orchestrates workflow execution across multiple agents"""
 
-    def __init__(self, agent_registry: Dict[str, str] = None):
+    def __init__(
+        self,
+        agent_registry: Mapping[str, str] = None,
+        max_connections: int = 200,
+        max_keepalive_connections: int = 50
+    ):
         """
         Initialize orchestrator
 
         Args:
             agent_registry: Dictionary mapping agent names to their URLs
                            e.g., {"swarm-converter": "http://agent-swarm-converter:8000"}
+            max_connections: Upper bound on concurrent connections to agents
+            max_keepalive_connections: Idle connections kept open for reuse
         """
-        self.agent_registry = agent_registry or {}
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(300.0))
-
-    async def discover_agents(self) -> Dict[str, Any]:
+        # Own copy: endpoints add/remove agents on it
+        self.agent_registry = dict(agent_registry) if agent_registry else {}
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(300.0, connect=AGENT_CONNECT_TIMEOUT),
+            # Limits go on the transport: the client ignores its own when given one
+            transport=httpx.AsyncHTTPTransport(
+                http2=AGENT_HTTP2,
+                retries=AGENT_CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections
+                )
+            )
+        )
+        # (monotonic timestamp, registry probed, discovered agents) of the last probe
+        self._discovery_cache: Optional[tuple] = None
+        self._discovery_ttl = DISCOVERY_CACHE_TTL
+        # LRU of successful call_agent() results, keyed by a digest of URL and input
+        self._result_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._result_cache_size = AGENT_RESULT_CACHE_SIZE
+
+    async def discover_agents(self, force: bool = False) -> Dict[str, Any]:
         """
-        Discover available agents by checking their health endpoints
+        Discover available agents by checking their health endpoints (all agents probed concurrently)
+
+        Results are reused for a few seconds so frequent polling doesn't re-probe
+        every agent; a change to the registry always triggers a fresh probe.
+
+        Args:
+            force: Probe the agents even if a recent result is cached
 
         Returns:
             Dictionary of agent info: {name: {url, status, capabilities}}
         """
-        discovered = {}
+        now = time.monotonic()
+        registry = tuple(self.agent_registry.items())
+        cached = self._discovery_cache
+        if (
+            not force
+            and cached is not None
+            and now - cached[0] < self._discovery_ttl
+            and cached[1] == registry
+        ):
+            discovered = cached[2]
+        else:
+            probes = await asyncio.gather(*[
+                self._probe_agent(agent_url) for _, agent_url in registry
+            ])
+            discovered = {
+                agent_name: info
+                for (agent_name, _), info in zip(registry, probes)
+                if info is not None
+            }
+            self._discovery_cache = (now, registry, discovered)
+
+        # Callers annotate the entries they get back - keep the cached ones untouched
+        return {agent_name: dict(info) for agent_name, info in discovered.items()}
+
+    async def _probe_agent(self, agent_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch an agent's /health and /info concurrently
+
+        Returns:
+            Agent info, an "unavailable" entry if the agent can't be reached,
+            or None if it answered /health with a non-200 status
+        """
+        health_result, info_result = await asyncio.gather(
+            self.client.get(f"{agent_url}/health"),
+            self.client.get(f"{agent_url}/info"),
+            return_exceptions=True
+        )
 
-        for agent_name, agent_url in self.agent_registry.items():
+        try:
+            if isinstance(health_result, BaseException):
+                raise health_result
+            if health_result.status_code != 200:
+                return None
+            health = orjson.loads(health_result.content)
+
+            # Get additional info
             try:
-                response = await self.client.get(f"{agent_url}/health")
-                if response.status_code == 200:
-                    health = response.json()
-
-                    # Get additional info
-                    try:
-                        info_response = await self.client.get(f"{agent_url}/info")
-                        info = info_response.json() if info_response.status_code == 200 else {}
-                    except:
-                        info = {}
-
-                    discovered[agent_name] = {
-                        "url": agent_url,
-                        "status": health.get("status", "unknown"),
-                        "model": health.get("model", "unknown"),
-                        "capabilities": info.get("capabilities", []),
-                        "description": info.get("config", {}).get("agent", {}).get("description", "")
-                    }
-            except Exception as e:
-                discovered[agent_name] = {
-                    "url": agent_url,
-                    "status": "unavailable",
-                    "error": str(e)
-                }
-
-        return discovered
+                info = orjson.loads(info_result.content) if info_result.status_code == 200 else {}
+            except:
+                info = {}
+
+            return {
+                "url": agent_url,
+                "status": health.get("status", "unknown"),
+                "model": health.get("model", "unknown"),
+                "capabilities": info.get("capabilities", []),
+                "description": info.get("config", {}).get("agent", {}).get("description", "")
+            }
+        except Exception as e:
+            return {
+                "url": agent_url,
+                "status": "unavailable",
+                "error": str(e)
+            }
 
     async def call_agent(
         self,
@@ -161,6 +467,7 @@ class WorkflowOrchestrator:
 
         Returns:
             Dictionary with 'success', 'output', 'raw_response' keys
+            ('cached' is set when the reply came from the result cache)
         """
         # Determine agent URL
         url = agent_url or self.agent_registry.get(agent_name)
@@ -171,35 +478,62 @@ class WorkflowOrchestrator:
                 "agent": agent_name
             }
 
+        # Identical input to the same agent: reuse its earlier reply
+        cache_key = None
+        if self._result_cache_size > 0:
+            cache_key = hashlib.blake2b(
+                f"{url}\0{input_text}".encode(), digest_size=16
+            ).digest()
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return {**cached, "cached": True}
+
         # Call agent's /process/raw endpoint for clean output
         endpoint = f"{url}/process/raw"
 
+        # Tag the call with the workflow execution it belongs to (if any) for log correlation
+        execution = current_execution.get()
+        headers = {"Content-Type": "application/json"}
+        if execution:
+            headers["X-Execution-ID"] = execution.execution_id
+
         try:
+            # orjson encodes large inputs (whole compose files) much faster than httpx's json=
             response = await self.client.post(
                 endpoint,
-                json={"input": input_text},
-                timeout=timeout
+                content=orjson.dumps({"input": input_text}),
+                headers=headers,
+                timeout=httpx.Timeout(timeout, connect=AGENT_CONNECT_TIMEOUT)
             )
             response.raise_for_status()
 
-            result = response.json()
+            result = orjson.loads(response.content)
 
-            return {
+            agent_result = {
                 "success": True,
                 "agent": agent_name,
                 "output": result.get("output", ""),
                 "format": result.get("format", "text"),
                 "raw_response": result,
-                "timestamp": result.get("timestamp", datetime.now().isoformat())
+                "timestamp": result["timestamp"] if "timestamp" in result else datetime.now().isoformat()
             }
+            if cache_key is not None:
+                self._result_cache[cache_key] = agent_result
+                if len(self._result_cache) > self._result_cache_size:
+                    self._result_cache.popitem(last=False)
+            return agent_result
 
         except httpx.HTTPError as e:
-            return {
+            error = {
                 "success": False,
                 "agent": agent_name,
                 "error": f"HTTP error: {str(e)}",
                 "error_type": "http_error"
             }
+            if isinstance(e, httpx.HTTPStatusError):
+                error["status_code"] = e.response.status_code
+            return error
         except Exception as e:
             return {
                 "success": False,
@@ -213,7 +547,7 @@ class WorkflowOrchestrator:
         step: WorkflowStep,
         initial_input: str,
         previous_output: Optional[str],
-        step_results: List[Dict[str, Any]]
+        step_results: Dict[int, Dict[str, Any]]
     ) -> str:
         """
         Determine the input for a workflow step based on its configuration
@@ -222,37 +556,29 @@ class WorkflowOrchestrator:
             step: The workflow step
             initial_input: The original workflow input
             previous_output: Output from the previous step
-            step_results: List of all previous step results
+            step_results: Results of the finished steps, keyed by step index
 
         Returns:
             Input text for this step
         """
-        if isinstance(step.input_source, str):
-            if step.input_source == "original":
-                return initial_input
-            elif step.input_source == "previous":
-                return previous_output or initial_input
-            elif step.input_source.startswith("step["):
-                # Reference a specific step by index, e.g., "step[0]"
-                try:
-                    index = int(step.input_source[5:-1])
-                    if 0 <= index < len(step_results):
-                        return step_results[index].get("output", "")
-                except (ValueError, IndexError):
-                    pass
-                return initial_input
-            else:
-                # Direct string value
-                return step.input_source
+        kind = step.input_kind
+        if kind == INPUT_PREVIOUS:
+            return previous_output or initial_input
+        elif kind == INPUT_ORIGINAL:
+            return initial_input
+        elif kind == INPUT_STEP:
+            if step.input_index in step_results:
+                return step_results[step.input_index].get("output", "")
+            return initial_input
         else:
-            # Assume it's a direct value
-            return str(step.input_source)
+            return step.input_literal
 
     async def execute_workflow(
         self,
         workflow: Workflow,
         initial_input: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        execution: Optional[WorkflowExecution] = None
     ) -> WorkflowExecution:
         """
         Execute a workflow with the given input
@@ -261,87 +587,220 @@ class WorkflowOrchestrator:
             workflow: Workflow definition to execute
             initial_input: Initial input to the workflow
             context: Optional context variables for the execution
+            execution: Optional pre-created execution record to fill in
 
         Returns:
             WorkflowExecution object with results
         """
-        execution = WorkflowExecution(workflow, initial_input)
+        if execution is None:
+            execution = WorkflowExecution(workflow, initial_input)
+        if execution.is_finished:
+            return execution
         execution.status = "running"
-        execution.start_time = datetime.now()
-
-        current_output = initial_input
+        execution.mark_started()
+
+        execution_token = current_execution.set(execution)
+
+        # Steps run as soon as the steps they depend on have finished (Kahn's algorithm),
+        # so independent branches call their agents concurrently
+        dependencies = workflow.dependencies
+        indegree = [len(deps) for deps in dependencies]
+        successors = [[] for _ in workflow.steps]
+        for i, deps in enumerate(dependencies):
+            for dep in deps:
+                successors[dep].append(i)
+
+        results: Dict[int, Dict[str, Any]] = {}
+        # Output each finished step hands to a following 'previous' step: its own output, or
+        # (when it produced none) the value its predecessor hands on once that one is known
+        chain_outputs: Dict[int, str] = {}
+        # Finished steps without output whose predecessor's chain value isn't known yet;
+        # their successors are held back until it is
+        chain_pending = set()
+        running: Dict[asyncio.Task, int] = {}
+        ready = [i for i, degree in enumerate(indegree) if degree == 0]
+
+        def release(i: int):
+            for successor in successors[i]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    ready.append(successor)
 
         try:
-            for i, step in enumerate(workflow.steps):
-                execution.current_step_index = i
-
-                # Determine input for this step
-                step_input = self._get_step_input(
-                    step,
-                    initial_input,
-                    current_output,
-                    execution.step_results
-                )
-
-                # Execute step with retry logic
-                attempts = 0
-                max_attempts = step.retry + 1
-                step_result = None
-
-                while attempts < max_attempts:
-                    attempts += 1
-
-                    step_result = await self.call_agent(
-                        agent_name=step.agent,
-                        input_text=step_input,
-                        agent_url=step.agent_url,
-                        timeout=step.timeout
-                    )
-
-                    if step_result.get("success"):
-                        break
-
-                    # If not successful and retries remain, wait and retry
-                    if attempts < max_attempts:
-                        await asyncio.sleep(2 ** attempts)  # Exponential backoff
-
-                # Add step metadata
-                step_result["step_name"] = step.name
-                step_result["step_index"] = i
-                step_result["attempts"] = attempts
-
-                execution.step_results.append(step_result)
-
-                # Handle step failure
-                if not step_result.get("success"):
-                    if step.on_error == "stop":
-                        execution.status = "failed"
-                        execution.error = f"Step '{step.name}' failed: {step_result.get('error')}"
-                        execution.end_time = datetime.now()
-                        return execution
-                    elif step.on_error == "skip":
-                        continue  # Skip to next step
-                    # If 'continue', proceed to next step
-
-                # Update current output for next step
-                current_output = step_result.get("output", current_output)
+            while ready or running:
+                if execution.status != "cancelled":
+                    for i in ready:
+                        step = workflow.steps[i]
+                        previous_output = chain_outputs.get(i - 1, initial_input) if i > 0 else initial_input
+                        if step.input_kind == INPUT_PREVIOUS:
+                            # Common case: feed the previous output straight through
+                            step_input = previous_output or initial_input
+                        else:
+                            step_input = self._get_step_input(step, initial_input, previous_output, results)
+                        execution.current_step_index = max(execution.current_step_index, i)
+                        running[asyncio.create_task(self._run_step(step, step_input))] = i
+                ready = []
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.get):
+                    i = running.pop(task)
+                    step = workflow.steps[i]
+                    step_result, attempts = task.result()
+                    step_result["step_name"] = step.name
+                    step_result["step_index"] = i
+                    step_result["attempts"] = attempts
+
+                    results[i] = step_result
+                    execution.step_results.append(step_result)
+
+                    # Handle step failure ('continue' and 'skip' let dependent steps run)
+                    if not step_result.get("success") and step.on_error == "stop":
+                        if execution.status != "cancelled":
+                            execution.status = "failed"
+                            execution.error = f"Step '{step.name}' failed: {step_result.get('error')}"
+                            execution.mark_finished()
+                        continue
+
+                    if "output" in step_result:
+                        chain_outputs[i] = step_result["output"]
+                    elif i == 0:
+                        chain_outputs[i] = initial_input
+                    elif i - 1 in chain_outputs:
+                        chain_outputs[i] = chain_outputs[i - 1]
+                    else:
+                        chain_pending.add(i)
+                        continue
+                    release(i)
+
+                    # Steps waiting on this chain value can pass it on now
+                    i += 1
+                    while i in chain_pending:
+                        chain_pending.discard(i)
+                        chain_outputs[i] = chain_outputs[i - 1]
+                        release(i)
+                        i += 1
+
+                if execution.status == "failed":
+                    break
+                if len(execution.step_results) > 1:
+                    execution.step_results.sort(key=lambda result: result["step_index"])
+                ready.sort()
+
+            if execution.is_finished:
+                return execution
 
             # All steps completed successfully
             execution.status = "completed"
-            execution.end_time = datetime.now()
+            execution.mark_finished()
 
         except Exception as e:
             execution.status = "failed"
             execution.error = f"Workflow execution error: {str(e)}"
-            execution.end_time = datetime.now()
+            execution.mark_finished()
+
+        finally:
+            for task in running:
+                task.cancel()
+            current_execution.reset(execution_token)
 
         return execution
 
+    async def _run_step(self, step: WorkflowStep, step_input: str) -> tuple:
+        """
+        Call a step's agent, retrying with exponential backoff
+
+        Args:
+            step: The workflow step
+            step_input: Input text for the step
+
+        Returns:
+            (last call_agent result, number of attempts)
+        """
+        attempts = 0
+        max_attempts = step.retry + 1
+        step_result = None
+
+        while attempts < max_attempts:
+            attempts += 1
+
+            step_result = await self.call_agent(
+                agent_name=step.agent,
+                input_text=step_input,
+                agent_url=step.agent_url,
+                timeout=step.timeout
+            )
+
+            if step_result.get("success"):
+                break
+
+            # The agent rejected the request itself; sending it again won't help
+            status_code = step_result.get("status_code")
+            if status_code and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_STATUSES:
+                break
+
+            # If not successful and retries remain, wait and retry (capped exponential backoff with jitter)
+            if attempts < max_attempts:
+                delay = min(RETRY_BACKOFF_BASE * 2 ** (attempts - 1), RETRY_BACKOFF_CAP)
+                await asyncio.sleep(delay * (0.5 + random.random()))
+
+        return step_result, attempts
+
     async def close(self):
         """Close the HTTP client"""
         await self.client.aclose()
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_workflow(content: bytes) -> Workflow:
+    """Parse workflow YAML; keyed by content, so a file rewritten with the same bytes isn't re-parsed"""
+    return Workflow(yaml.load(content, Loader=YamlLoader))
+
+
+def _json_sidecar_path(filepath: Path) -> Path:
+    """Hidden JSON copy of a YAML file, kept next to it (not matched by *.yml globs)"""
+    return filepath.with_name(f".{filepath.name}.json")
+
+
+def _write_json_sidecar(sidecar: Path, data: Any):
+    """Atomically write a JSON sidecar; best effort (unwritable dirs, non-JSON values are skipped)"""
+    try:
+        # Dates stay unsupported (as with the stdlib encoder) so they never come back as strings
+        content = orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        return
+    tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_workflow_file(filepath: str, mtime_ns: int, size: int) -> Workflow:
+    """Read a workflow file; cached per (path, mtime, size) so edits invalidate it"""
+    if WORKFLOW_JSON_CACHE:
+        sidecar = _json_sidecar_path(Path(filepath))
+        try:
+            if sidecar.stat().st_mtime_ns >= mtime_ns:
+                return Workflow(orjson.loads(sidecar.read_bytes()))
+        except (OSError, ValueError):
+            pass
+
+    with open(filepath, "rb") as f:
+        content = f.read()
+
+    if not WORKFLOW_JSON_CACHE:
+        return _parse_workflow(content)
+
+    config = yaml.load(content, Loader=YamlLoader)
+    workflow = Workflow(config)
+    _write_json_sidecar(sidecar, config)
+    return workflow
+
+
 class WorkflowManager:
     """Manages workflow definitions and executions"""
 
@@ -355,83 +814,127 @@ class WorkflowManager:
         if self.examples_dir:
             self.examples_dir.mkdir(parents=True, exist_ok=True)
 
-        self._workflow_cache = {}
+    @staticmethod
+    def _scan_workflow_files(directory: Path) -> List[os.DirEntry]:
+        """Workflow files (*.yml, not hidden) in a directory, sorted by name"""
+        try:
+            with os.scandir(directory) as it:
+                entries = [
+                    entry for entry in it
+                    if entry.name.endswith(".yml") and not entry.name.startswith(".") and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda entry: entry.name)
+        return entries
+
+    def get_listing_signature(self) -> tuple:
+        """
+        Cheap fingerprint of every workflow file (stat only, no parsing).
+
+        Returns:
+            Tuple of (path, mtime_ns, size) that changes whenever a workflow
+            file is added, removed or modified
+        """
+        directories = [self.workflows_dir]
+        if self.examples_dir:
+            directories.append(self.examples_dir)
+
+        signature = []
+        for directory in directories:
+            for entry in self._scan_workflow_files(directory):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                signature.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    @staticmethod
+    def _try_load_entry(entry: os.DirEntry):
+        """Load a scanned workflow file through the parse cache, returning the exception instead of raising it"""
+        try:
+            stat = entry.stat()
+            return _load_workflow_file(entry.path, stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            return e
 
     def list_workflows(self) -> List[Dict[str, Any]]:
         """List all available workflows from both examples and runtime directories"""
         workflows = []
         workflow_names = set()  # Track names to avoid duplicates
 
-        # First, scan runtime workflows (user-created, higher priority)
-        for filepath in self.workflows_dir.glob("*.yml"):
-            try:
-                workflow = Workflow.from_file(filepath)
-                workflow_names.add(workflow.name)
-                workflows.append({
-                    "name": workflow.name,
-                    "description": workflow.description,
-                    "version": workflow.version,
-                    "steps": len(workflow.steps),
-                    "file": filepath.name,
-                    "source": "runtime"
-                })
-            except Exception as e:
-                workflows.append({
-                    "name": filepath.stem,
-                    "error": f"Failed to load: {str(e)}",
-                    "file": filepath.name,
-                    "source": "runtime"
-                })
-
-        # Then, scan example workflows (git-tracked templates)
+        # Runtime workflows (user-created) take priority over example workflows (git-tracked templates)
+        candidates = [(entry, "runtime") for entry in self._scan_workflow_files(self.workflows_dir)]
         if self.examples_dir:
-            for filepath in self.examples_dir.glob("*.yml"):
-                try:
-                    workflow = Workflow.from_file(filepath)
-                    # Skip if already loaded from runtime (user override)
-                    if workflow.name not in workflow_names:
-                        workflows.append({
-                            "name": workflow.name,
-                            "description": workflow.description,
-                            "version": workflow.version,
-                            "steps": len(workflow.steps),
-                            "file": filepath.name,
-                            "source": "examples"
-                        })
-                except Exception as e:
-                    if filepath.stem not in workflow_names:
-                        workflows.append({
-                            "name": filepath.stem,
-                            "error": f"Failed to load: {str(e)}",
-                            "file": filepath.name,
-                            "source": "examples"
-                        })
+            candidates.extend((entry, "examples") for entry in self._scan_workflow_files(self.examples_dir))
 
-        return workflows
+        # Parse the files concurrently, then merge them in the order above
+        if len(candidates) > 1:
+            with ThreadPoolExecutor(max_workers=min(WORKFLOW_LOAD_WORKERS, len(candidates))) as executor:
+                loaded = list(executor.map(self._try_load_entry, [entry for entry, _ in candidates]))
+        else:
+            loaded = [self._try_load_entry(entry) for entry, _ in candidates]
+
+        for (entry, source), workflow in zip(candidates, loaded):
+            if isinstance(workflow, Exception):
+                # Skip if already loaded from runtime (user override)
+                stem = entry.name[:-len(".yml")]
+                if source == "runtime" or stem not in workflow_names:
+                    workflows.append({
+                        "name": stem,
+                        "error": f"Failed to load: {str(workflow)}",
+                        "file": entry.name,
+                        "source": source
+                    })
+                continue
+
+            if source == "runtime":
+                workflow_names.add(workflow.name)
+            elif workflow.name in workflow_names:
+                continue
+
+            workflows.append({
+                "name": workflow.name,
+                "description": workflow.description,
+                "version": workflow.version,
+                "steps": len(workflow.steps),
+                "file": entry.name,
+                "source": source
+            })
 
-    def load_workflow(self, name: str) -> Optional[Workflow]:
-        """Load a workflow by name from runtime or examples directory"""
-        # Check cache first
-        if name in self._workflow_cache:
-            return self._workflow_cache[name]
+        return workflows
 
-        # Try runtime directory first (user workflows take priority)
-        filepath = self.workflows_dir / f"{name}.yml"
-        if filepath.exists():
-            workflow = Workflow.from_file(filepath)
-            self._workflow_cache[name] = workflow
-            return workflow
+    def get_workflow_signature(self, name: str) -> Optional[tuple]:
+        """
+        Locate a workflow file by name (runtime first, then examples).
 
-        # Fall back to examples directory
+        Returns:
+            (filepath, mtime_ns, size) for the file that would be loaded, or None
+        """
+        directories = [self.workflows_dir]
         if self.examples_dir:
-            filepath = self.examples_dir / f"{name}.yml"
-            if filepath.exists():
-                workflow = Workflow.from_file(filepath)
-                self._workflow_cache[name] = workflow
-                return workflow
+            directories.append(self.examples_dir)
+
+        for directory in directories:
+            filepath = directory / f"{name}.yml"
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue
+            return filepath, stat.st_mtime_ns, stat.st_size
 
         return None
 
+    def load_workflow(self, name: str) -> Optional[Workflow]:
+        """Load a workflow by name from runtime or examples directory"""
+        signature = self.get_workflow_signature(name)
+        if signature is None:
+            return None
+
+        filepath, mtime_ns, size = signature
+        return _load_workflow_file(str(filepath), mtime_ns, size)
+
     def save_workflow(self, workflow_config: Dict[str, Any]) -> str:
         """Save a workflow configuration to runtime directory"""
         name = workflow_config.get("name", "unnamed")
@@ -439,11 +942,7 @@ class WorkflowManager:
         filepath = self.workflows_dir / f"{name}.yml"
 
         with open(filepath, "w") as f:
-            yaml.dump(workflow_config, f, default_flow_style=False, sort_keys=False)
-
-        # Clear cache for this workflow
-        if name in self._workflow_cache:
-            del self._workflow_cache[name]
+            yaml.dump(workflow_config, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
 
         return str(filepath)
 
@@ -453,7 +952,6 @@ class WorkflowManager:
         filepath = self.workflows_dir / f"{name}.yml"
         if filepath.exists():
             filepath.unlink()
-            if name in self._workflow_cache:
-                del self._workflow_cache[name]
+            _json_sidecar_path(filepath).unlink(missing_ok=True)
             return True
         return False
@@ -5,62 +5,83 @@ Handles plugin discovery, validation, and dynamic registration.
 """
 
 import os
+import re
+import orjson
 import yaml
 import docker
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Mapping
+from datetime import datetime, timezone
+import time
 import logging
 
+from orchestrator import _json_sidecar_path, _write_json_sidecar
+
 logger = logging.getLogger(__name__)
 
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+    logger.info("LibYAML not available; parsing plugin manifests with the pure-Python YAML loader")
 
-class PluginManifest:
-    """Represents a plugin manifest (plugin.yml)"""
+# Keep a JSON copy of each parsed manifest (.plugin.yml.json) and load it instead of the
+# YAML while it is at least as new (same switch as the workflow cache in orchestrator)
+PLUGIN_JSON_CACHE = os.getenv("WORKFLOW_JSON_CACHE", "0") == "1"
 
-    def __init__(self, data: Dict[str, Any], source_path: Optional[Path] = None):
-        self.data = data
-        self.source_path = source_path
+# Worker threads used to read and validate plugin manifests during discovery
+MANIFEST_LOAD_WORKERS = 8
 
-    @property
-    def id(self) -> str:
-        return self.data.get("plugin", {}).get("id", "")
 
-    @property
-    def name(self) -> str:
-        return self.data.get("plugin", {}).get("name", self.id)
+def _load_manifest_data(plugin_yml_path: Path) -> Any:
+    """Parse a plugin.yml, going through its JSON sidecar when PLUGIN_JSON_CACHE is on"""
+    if not PLUGIN_JSON_CACHE:
+        with open(plugin_yml_path, "rb") as f:
+            return yaml.load(f, Loader=YamlLoader)
 
-    @property
-    def description(self) -> str:
-        return self.data.get("plugin", {}).get("description", "")
+    sidecar = _json_sidecar_path(plugin_yml_path)
+    try:
+        if sidecar.stat().st_mtime_ns >= plugin_yml_path.stat().st_mtime_ns:
+            return orjson.loads(sidecar.read_bytes())
+    except (OSError, ValueError):
+        pass
 
-    @property
-    def version(self) -> str:
-        return self.data.get("plugin", {}).get("version", "1.0.0")
+    with open(plugin_yml_path, "rb") as f:
+        data = yaml.load(f, Loader=YamlLoader)
 
-    @property
-    def author(self) -> str:
-        return self.data.get("plugin", {}).get("author", "")
+    _write_json_sidecar(sidecar, data)
 
-    @property
-    def tags(self) -> List[str]:
-        return self.data.get("plugin", {}).get("tags", [])
+    return data
 
-    @property
-    def icon(self) -> str:
-        return self.data.get("plugin", {}).get("icon", "🔌")
 
-    @property
-    def port(self) -> int:
-        return self.data.get("agent", {}).get("port", 8000)
+class PluginManifest:
+    """Represents a plugin manifest (plugin.yml)"""
+
+    __slots__ = (
+        "data", "source_path", "id", "name", "description", "version", "author",
+        "tags", "icon", "port", "capabilities", "api_endpoint",
+    )
 
-    @property
-    def capabilities(self) -> List[str]:
-        return self.data.get("capabilities", [])
+    def __init__(self, data: Dict[str, Any], source_path: Optional[Path] = None):
+        self.data = data
+        self.source_path = source_path
 
-    @property
-    def api_endpoint(self) -> str:
-        return self.data.get("api", {}).get("endpoint", "/process")
+        # Flatten the fields once; manifests are immutable after loading
+        plugin = data.get("plugin") or {}
+        agent = data.get("agent") or {}
+        self.id: str = plugin.get("id", "")
+        self.name: str = plugin.get("name", self.id)
+        self.description: str = plugin.get("description", "")
+        self.version: str = plugin.get("version", "1.0.0")
+        self.author: str = plugin.get("author", "")
+        self.tags: List[str] = plugin.get("tags", [])
+        self.icon: str = plugin.get("icon", "🔌")
+        self.port: int = agent.get("port", 8000)
+        self.capabilities: List[str] = data.get("capabilities", [])
+        self.api_endpoint: str = (data.get("api") or {}).get("endpoint", "/process")
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses"""
@@ -82,12 +103,15 @@ class PluginManifest:
 class PluginValidator:
     """Validates plugin manifests"""
 
-    REQUIRED_FIELDS = [
-        ("plugin", "id"),
-        ("plugin", "name"),
-        ("plugin", "description"),
-        ("agent", "port"),
-    ]
+    REQUIRED_FIELDS = {
+        "plugin": ("id", "name", "description"),
+        "agent": ("port",),
+    }
+
+    # Values that certainly pass the format checks below (the common case); anything
+    # else goes through the detailed checks that produce the error messages
+    VALID_ID_PATTERN = re.compile(r"^[a-z0-9_-]*[a-z0-9][a-z0-9_-]*$")
+    VALID_VERSION_PATTERN = re.compile(r"^[0-9][0-9A-Za-z.-]*$")
 
     @staticmethod
     def validate(manifest_data: Dict[str, Any]) -> tuple[bool, List[str]]:
@@ -100,24 +124,18 @@ class PluginValidator:
         errors = []
 
         # Check required fields
-        for *parents, field in PluginValidator.REQUIRED_FIELDS:
-            current = manifest_data
-            path = []
-
-            for parent in parents:
-                path.append(parent)
-                if parent not in current:
-                    errors.append(f"Missing required field: {'.'.join(path)}")
-                    break
-                current = current[parent]
-            else:
-                if field not in current:
-                    path.append(field)
-                    errors.append(f"Missing required field: {'.'.join(path)}")
+        for parent, fields in PluginValidator.REQUIRED_FIELDS.items():
+            if parent not in manifest_data:
+                errors.append(f"Missing required field: {parent}")
+                continue
+            section = manifest_data[parent]
+            for field in fields:
+                if field not in section:
+                    errors.append(f"Missing required field: {parent}.{field}")
 
         # Validate plugin ID format
         plugin_id = manifest_data.get("plugin", {}).get("id", "")
-        if plugin_id:
+        if plugin_id and not (isinstance(plugin_id, str) and PluginValidator.VALID_ID_PATTERN.match(plugin_id)):
             if not plugin_id.replace("-", "").replace("_", "").isalnum():
                 errors.append(f"Invalid plugin ID format: {plugin_id} (use lowercase alphanumeric with hyphens)")
             if plugin_id != plugin_id.lower():
@@ -133,8 +151,9 @@ class PluginValidator:
 
         # Validate version format (basic check)
         version = manifest_data.get("plugin", {}).get("version", "")
-        if version and not version.replace(".", "").replace("-", "").replace("alpha", "").replace("beta", "").isalnum():
-            errors.append(f"Invalid version format: {version}")
+        if version and not (isinstance(version, str) and PluginValidator.VALID_VERSION_PATTERN.match(version)):
+            if not version.replace(".", "").replace("-", "").replace("alpha", "").replace("beta", "").isalnum():
+                errors.append(f"Invalid version format: {version}")
 
         return len(errors) == 0, errors
 
@@ -150,8 +169,7 @@ class PluginValidator:
             if not plugin_yml_path.exists():
                 return False, [f"Plugin manifest not found: {plugin_yml_path}"], None
 
-            with open(plugin_yml_path, "r") as f:
-                data = yaml.safe_load(f)
+            data = _load_manifest_data(plugin_yml_path)
 
             is_valid, errors = PluginValidator.validate(data)
 
@@ -178,6 +196,11 @@ class PluginRegistry:
         self.plugins: Dict[str, Dict[str, Any]] = {}
         self.docker_client = None
 
+        # Bumped on every register/unregister; read-only snapshots are rebuilt only when it changes
+        self._version = 0
+        self._plugins_snapshot: Optional[tuple] = None
+        self._legacy_snapshot: Optional[tuple] = None
+
         try:
             self.docker_client = docker.from_env()
         except Exception as e:
@@ -185,22 +208,37 @@ class PluginRegistry:
 
     def register(self, plugin_id: str, url: str, manifest: Optional[PluginManifest] = None, source: str = "runtime"):
         """Register a plugin manually"""
-        self.plugins[plugin_id] = {
+        self.plugins[plugin_id] = self._plugin_entry(plugin_id, url, manifest, source)
+        self._version += 1
+        logger.info(f"Registered plugin: {plugin_id} at {url} (source: {source})")
+
+    @staticmethod
+    def _plugin_entry(plugin_id: str, url: str, manifest: Optional[PluginManifest], source: str) -> Dict[str, Any]:
+        """Build the registry entry for a plugin"""
+        return {
             "id": plugin_id,
             "url": url,
             "manifest": manifest.to_dict() if manifest else None,
-            "registered_at": datetime.utcnow().isoformat(),
+            "registered_at": time.time(),  # epoch seconds; see registered_at_iso()
             "status": "registered",
             "source": source,  # "example", "runtime", or "docker"
         }
-        logger.info(f"Registered plugin: {plugin_id} at {url} (source: {source})")
 
     def unregister(self, plugin_id: str):
         """Unregister a plugin"""
         if plugin_id in self.plugins:
             del self.plugins[plugin_id]
+            self._version += 1
             logger.info(f"Unregistered plugin: {plugin_id}")
 
+    @staticmethod
+    def registered_at_iso(plugin: Dict[str, Any]) -> Optional[str]:
+        """Registration time of a plugin entry as an ISO 8601 UTC string (formatted on demand)"""
+        registered_at = plugin.get("registered_at")
+        if registered_at is None:
+            return None
+        return datetime.fromtimestamp(registered_at, tz=timezone.utc).isoformat()
+
     def get(self, plugin_id: str) -> Optional[Dict[str, Any]]:
         """Get plugin by ID"""
         return self.plugins.get(plugin_id)
@@ -210,9 +248,11 @@ class PluginRegistry:
         plugin = self.plugins.get(plugin_id)
         return plugin["url"] if plugin else None
 
-    def list_all(self) -> Dict[str, Dict[str, Any]]:
-        """Get all registered plugins"""
-        return self.plugins.copy()
+    def list_all(self) -> Mapping[str, Dict[str, Any]]:
+        """Get all registered plugins (read-only snapshot, reused until the registry changes)"""
+        if not self._plugins_snapshot or self._plugins_snapshot[0] != self._version:
+            self._plugins_snapshot = (self._version, MappingProxyType(dict(self.plugins)))
+        return self._plugins_snapshot[1]
 
     def discover_from_filesystem(self):
         """Discover plugins from filesystem (examples + runtime)"""
@@ -231,9 +271,68 @@ class PluginRegistry:
         logger.info(f"Discovered {discovered} plugins from filesystem")
         return discovered
 
-    def _discover_from_directory(self, base_dir: Path, source: str) -> int:
-        """Discover plugins from a directory"""
-        count = 0
+    def find_manifests(self) -> List[tuple]:
+        """
+        List plugin manifests on the filesystem without loading them.
+
+        Returns:
+            List of (plugin.yml path, source) tuples in registration order:
+            examples first, then runtime (so runtime agents override examples)
+        """
+        manifests = []
+        for base_dir, source in (
+            (self.project_root / "examples" / "agents", "example"),
+            (self.project_root / "runtime" / "agents", "runtime"),
+        ):
+            if base_dir.exists():
+                manifests.extend((plugin_yml, source) for plugin_yml in self._find_manifests_in(base_dir))
+        return manifests
+
+    @staticmethod
+    def load_manifest(plugin_yml: Path) -> Optional[PluginManifest]:
+        """Load and validate a plugin.yml, returning None if it is invalid"""
+        is_valid, errors, manifest = PluginValidator.validate_file(plugin_yml)
+
+        if not is_valid:
+            logger.warning(f"Invalid plugin manifest in {plugin_yml.parent.name}: {errors}")
+            return None
+
+        return manifest
+
+    def register_manifest(self, manifest: PluginManifest, source: str):
+        """Register a validated manifest under its plugin ID"""
+        # Construct URL based on agent name
+        agent_name = manifest.id
+        url = f"http://agent-{agent_name}:8000"
+
+        self.register(agent_name, url, manifest, source=source)
+
+    def register_manifests(self, manifests: List[tuple]) -> int:
+        """
+        Register validated manifests in one registry update.
+
+        Args:
+            manifests: (manifest, source) pairs in registration order; later
+                       entries override earlier ones with the same plugin ID
+
+        Returns:
+            Number of manifests registered
+        """
+        additions = {}
+        for manifest, source in manifests:
+            url = f"http://agent-{manifest.id}:8000"
+            additions[manifest.id] = self._plugin_entry(manifest.id, url, manifest, source)
+            logger.debug(f"Registered plugin: {manifest.id} at {url} (source: {source})")
+
+        if additions:
+            self.plugins.update(additions)
+            self._version += 1
+            logger.info(f"Registered {len(manifests)} plugins")
+        return len(manifests)
+
+    def _find_manifests_in(self, base_dir: Path) -> List[Path]:
+        """Find plugin.yml files in the agent directories under base_dir"""
+        manifests = []
 
         for agent_dir in base_dir.iterdir():
             if not agent_dir.is_dir():
@@ -244,20 +343,19 @@ class PluginRegistry:
                 logger.debug(f"Skipping {agent_dir.name}: no plugin.yml")
                 continue
 
-            is_valid, errors, manifest = PluginValidator.validate_file(plugin_yml)
+            manifests.append(plugin_yml)
 
-            if not is_valid:
-                logger.warning(f"Invalid plugin manifest in {agent_dir.name}: {errors}")
-                continue
-
-            # Construct URL based on agent name
-            agent_name = manifest.id
-            url = f"http://agent-{agent_name}:8000"
+        return manifests
 
-            self.register(agent_name, url, manifest, source=source)
-            count += 1
+    def _discover_from_directory(self, base_dir: Path, source: str) -> int:
+        """Discover plugins from a directory (manifests are parsed concurrently, registered in order)"""
+        manifest_paths = self._find_manifests_in(base_dir)
+        if not manifest_paths:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(MANIFEST_LOAD_WORKERS, len(manifest_paths))) as executor:
+            manifests = list(executor.map(self.load_manifest, manifest_paths))
 
-        return count
+        return self.register_manifests([(manifest, source) for manifest in manifests if manifest])
 
     def discover_from_docker(self):
         """Discover running agent containers from Docker"""
@@ -268,40 +366,46 @@ class PluginRegistry:
         discovered = 0
 
         try:
-            # Find all containers with name pattern "agent-*"
-            containers = self.docker_client.containers.list(
-                filters={"name": "agent-"}
-            )
+            # Find all containers with name pattern "agent-*". The low-level list returns
+            # names and port bindings directly, with no inspect call per container.
+            containers = self.docker_client.api.containers(filters={"name": "agent-"})
 
             for container in containers:
-                container_name = container.name
+                names = container.get("Names") or []
+                if not names:
+                    continue
+                container_name = names[0].lstrip("/")
                 if not container_name.startswith("agent-"):
                     continue
 
                 # Extract agent name
                 agent_name = container_name.replace("agent-", "")
 
-                # Get port mapping
-                port_mapping = container.attrs.get("NetworkSettings", {}).get("Ports", {})
-                internal_port = "8000/tcp"
-
-                if internal_port in port_mapping and port_mapping[internal_port]:
-                    host_port = port_mapping[internal_port][0]["HostPort"]
-                    url = f"http://localhost:{host_port}"
+                # Only agents publishing their API port (8000/tcp) on the host
+                published = any(
+                    port.get("PrivatePort") == 8000 and port.get("Type") == "tcp" and port.get("PublicPort")
+                    for port in container.get("Ports") or []
+                )
 
-                    # Try to read plugin.yml from container if not already registered
-                    if agent_name not in self.plugins:
-                        # Use internal network URL for service-to-service communication
-                        internal_url = f"http://{container_name}:8000"
-                        self.register(agent_name, internal_url, source="docker")
-                        discovered += 1
-                        logger.info(f"Discovered running agent from Docker: {agent_name}")
+                # Try to read plugin.yml from container if not already registered
+                if published and agent_name not in self.plugins:
+                    # Use internal network URL for service-to-service communication
+                    internal_url = f"http://{container_name}:8000"
+                    self.register(agent_name, internal_url, source="docker")
+                    discovered += 1
+                    logger.info(f"Discovered running agent from Docker: {agent_name}")
 
         except Exception as e:
             logger.error(f"Error discovering agents from Docker: {e}")
 
         return discovered
 
+    def close(self):
+        """Close the Docker client connection"""
+        if self.docker_client:
+            self.docker_client.close()
+            self.docker_client = None
+
     def discover_all(self):
         """Run all discovery methods"""
         fs_count = self.discover_from_filesystem()
@@ -312,6 +416,13 @@ class PluginRegistry:
 
         return total
 
-    def to_legacy_registry(self) -> Dict[str, str]:
-        """Convert to legacy AGENT_REGISTRY format (plugin_id -> url)"""
-        return {plugin_id: plugin["url"] for plugin_id, plugin in self.plugins.items()}
+    def to_legacy_registry(self) -> Mapping[str, str]:
+        """
+        Convert to legacy AGENT_REGISTRY format (plugin_id -> url).
+        Read-only snapshot, reused until the registry changes.
+        """
+        if not self._legacy_snapshot or self._legacy_snapshot[0] != self._version:
+            self._legacy_snapshot = (self._version, MappingProxyType(
+                {plugin_id: plugin["url"] for plugin_id, plugin in self.plugins.items()}
+            ))
+        return self._legacy_snapshot[1]
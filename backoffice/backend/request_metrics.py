@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Request Metrics Module
+Per-route request timing with X-Request-ID propagation, exposed in Prometheus text format.
+"""
+
+import time
+import uuid
+from typing import Dict, Any, List, Tuple
+
+
+# Histogram bucket upper bounds in seconds (exponential, 5ms .. ~82s)
+DEFAULT_BUCKETS = tuple(0.005 * 2 ** i for i in range(15))
+
+# Methods kept as their own label; anything else a client sends is recorded as "OTHER"
+STANDARD_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+
+
+class RequestMetrics:
+    """
+    Latency histograms keyed by (method, route template, status).
+    Route templates (e.g. /api/workflows/{workflow_name}) and folding non-standard
+    methods into "OTHER" keep the label set bounded.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # (method, route, status) -> [bucket counts..., count, sum_seconds]
+        self._series: Dict[Tuple[str, str, int], List[Any]] = {}
+
+    def observe(self, method: str, route: str, status: int, duration_ns: int):
+        """Record one request duration"""
+        key = (method, route, status)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+
+        seconds = duration_ns / 1e9
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                series[i] += 1
+                break
+        series[-2] += 1
+        series[-1] += seconds
+
+    def render(self) -> str:
+        """Render all series in Prometheus text exposition format"""
+        lines = [
+            "# HELP backoffice_request_duration_seconds Request handling time per route",
+            "# TYPE backoffice_request_duration_seconds histogram",
+        ]
+        for (method, route, status), series in sorted(self._series.items()):
+            labels = f'method="{method}",route="{route}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'backoffice_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'backoffice_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series[-2]}')
+            lines.append(f"backoffice_request_duration_seconds_count{{{labels}}} {series[-2]}")
+            lines.append(f"backoffice_request_duration_seconds_sum{{{labels}}} {series[-1]:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware that times every HTTP request and tags it with an X-Request-ID.
+
+    An incoming X-Request-ID header is reused, otherwise a new one is generated.
+    Written as plain ASGI (not BaseHTTPMiddleware) so streaming responses and
+    context variables pass through untouched.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex.encode()
+
+        status = 500
+        start = time.perf_counter_ns()
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            # The router stores the matched route on the scope; unmatched paths share one label
+            route = scope.get("route")
+            method = scope["method"]
+            self.metrics.observe(
+                method if method in STANDARD_METHODS else "OTHER",
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter_ns() - start
+            )
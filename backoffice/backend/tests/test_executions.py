@@ -0,0 +1,59 @@
+"""
+Execution endpoint tests: background runs and cancellation.
+The orchestrator is replaced with one whose agent calls are stubbed.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as backoffice  # noqa: E402
+from orchestrator import Workflow, WorkflowOrchestrator  # noqa: E402
+
+
+class HangingOrchestrator(WorkflowOrchestrator):
+    """Orchestrator whose agent calls never return until cancelled"""
+
+    def __init__(self):
+        super().__init__({})
+        self.started = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    async def call_agent(self, agent_name, input_text, agent_url=None, timeout=300):
+        self.started.set()
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+
+def test_delete_stops_in_flight_step(monkeypatch):
+    workflow = Workflow({"name": "wf", "steps": [{"name": "a", "agent": "A"}]})
+    monkeypatch.setattr(backoffice.workflow_manager, "load_workflow", lambda name: workflow)
+
+    async def main():
+        orchestrator = HangingOrchestrator()
+        monkeypatch.setattr(backoffice, "orchestrator", orchestrator)
+        monkeypatch.setattr(backoffice, "execution_slots", asyncio.Semaphore(1))
+
+        response = await backoffice.execute_workflow(
+            "wf", backoffice.WorkflowExecuteRequest(input="x"), wait=False
+        )
+        execution_id = orjson.loads(response.body)["execution_id"]
+        await asyncio.wait_for(orchestrator.started.wait(), 1)
+
+        await backoffice.cancel_execution(execution_id)
+        await asyncio.wait_for(orchestrator.cancelled.wait(), 1)
+
+        # The slot is free again once the step has stopped
+        await asyncio.wait_for(backoffice.execution_slots.acquire(), 1)
+        return backoffice.executions.get(execution_id)
+
+    execution = asyncio.run(main())
+    assert execution.status == "cancelled"
+    assert execution.execution_id not in backoffice.running_tasks
@@ -0,0 +1,111 @@
+"""
+Workflow scheduling tests for WorkflowOrchestrator.execute_workflow.
+Agent calls are stubbed, so no agents or network are needed.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import ExecutionStore, Workflow, WorkflowExecution, WorkflowOrchestrator  # noqa: E402
+
+
+class StubOrchestrator(WorkflowOrchestrator):
+    """Orchestrator whose agents answer after a per-agent delay"""
+
+    def __init__(self, delays=None, failing=()):
+        super().__init__({})
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.inputs = {}
+
+    async def call_agent(self, agent_name, input_text, agent_url=None, timeout=300):
+        self.inputs[agent_name] = input_text
+        await asyncio.sleep(self.delays.get(agent_name, 0.01))
+        if agent_name in self.failing:
+            return {"success": False, "agent": agent_name, "error": "boom"}
+        return {"success": True, "agent": agent_name, "output": f"{agent_name}-OUT"}
+
+
+def run(config, initial_input="INIT", **kwargs):
+    orchestrator = StubOrchestrator(**kwargs)
+    execution = asyncio.run(orchestrator.execute_workflow(Workflow(config), initial_input))
+    return execution, orchestrator
+
+
+def test_sequential_chain_passes_outputs_along():
+    execution, orchestrator = run({"steps": [
+        {"name": "a", "agent": "A"},
+        {"name": "b", "agent": "B"},
+        {"name": "c", "agent": "C"},
+    ]})
+
+    assert execution.status == "completed"
+    assert orchestrator.inputs == {"A": "INIT", "B": "A-OUT", "C": "B-OUT"}
+
+
+def test_failed_step_passes_on_output_of_still_running_predecessor():
+    # B fails while A is still running; C must get A's output, not the initial input
+    execution, orchestrator = run(
+        {"steps": [
+            {"name": "a", "agent": "A", "input": "original"},
+            {"name": "b", "agent": "B", "input": "original", "on_error": "continue"},
+            {"name": "c", "agent": "C"},
+        ]},
+        delays={"A": 0.1, "B": 0.01},
+        failing={"B"}
+    )
+
+    assert execution.status == "completed"
+    assert orchestrator.inputs["C"] == "A-OUT"
+
+
+def test_failed_first_step_passes_on_initial_input():
+    execution, orchestrator = run(
+        {"steps": [
+            {"name": "a", "agent": "A", "on_error": "continue"},
+            {"name": "b", "agent": "B"},
+        ]},
+        failing={"A"}
+    )
+
+    assert execution.status == "completed"
+    assert orchestrator.inputs["B"] == "INIT"
+
+
+def test_stop_on_error_fails_execution():
+    execution, orchestrator = run(
+        {"steps": [
+            {"name": "a", "agent": "A"},
+            {"name": "b", "agent": "B"},
+        ]},
+        failing={"A"}
+    )
+
+    assert execution.status == "failed"
+    assert "B" not in orchestrator.inputs
+
+
+
+def test_execution_store_keeps_unfinished_executions():
+    store = ExecutionStore(max_size=2)
+    workflow = Workflow({"steps": []})
+    running = WorkflowExecution(workflow, "a")
+    finished = WorkflowExecution(workflow, "b")
+    finished.cancel()
+    store.put(running)
+    store.put(finished)
+
+    newest = WorkflowExecution(workflow, "c")
+    store.put(newest)
+
+    # The oldest entry is still running, so the finished one goes instead
+    assert running.execution_id in store
+    assert finished.execution_id not in store
+    assert newest.execution_id in store
+
+    another = WorkflowExecution(workflow, "d")
+    store.put(another)
+    assert len(store) == 3
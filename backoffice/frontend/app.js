@@ -1806,11 +1806,18 @@ const app = {
                 })
             });
 
+            // Execution runs in the background - poll until it finishes
+            const execution = await this.waitForExecution(result.execution_id);
+
             // Show results in dialog
-            const resultHtml = this.formatExecutionResultForDialog(result.result);
+            const resultHtml = this.formatExecutionResultForDialog(execution);
             await Dialog.alert(resultHtml, `Workflow Result: ${workflowName}`);
 
-            Toast.success('Workflow executed successfully!');
+            if (execution.status === 'completed') {
+                Toast.success('Workflow executed successfully!');
+            } else {
+                Toast.error(`Workflow ${execution.status}`);
+            }
             this.loadExecutions();
         } catch (error) {
             await Dialog.alert(
@@ -1820,6 +1827,16 @@ const app = {
         }
     },
 
+    async waitForExecution(executionId, intervalMs = 2000) {
+        while (true) {
+            const execution = await this.apiCall(`/executions/${executionId}`);
+            if (['completed', 'failed', 'cancelled'].includes(execution.status)) {
+                return execution;
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    },
+
     formatExecutionResultForDialog(execution) {
         const statusIcon = execution.status === 'completed' ? '✓' : '✗';
         const statusClass = execution.status === 'completed' ? 'success' : 'error';
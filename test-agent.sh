@@ -3,32 +3,58 @@
 # Test script for swarm-converter agent
 
 if [ -z "$1" ]; then
-    echo "Usage: $0 <docker-compose.yml>"
+    echo "Usage: $0 <docker-compose.yml> [more-compose.yml ...]"
     echo ""
     echo "Example:"
     echo "  $0 test-compose.yml"
+    echo "  $0 test-compose.yml example-compose.yml"
+    echo "  MAX_JOBS=4 $0 compose/*.yml"
     exit 1
 fi
 
-COMPOSE_FILE="$1"
-
-if [ ! -f "$COMPOSE_FILE" ]; then
-    echo "Error: File '$COMPOSE_FILE' not found"
-    exit 1
-fi
-
-echo "Converting $COMPOSE_FILE to Docker Swarm stack file..."
-echo ""
-
-# Create JSON payload
-CONTENT=$(cat "$COMPOSE_FILE" | jq -Rs .)
-
-# Make the API request
-curl -X POST http://localhost:7001/process \
-  -H "Content-Type: application/json" \
-  -d "{\"input\": $CONTENT}" \
-  -s | jq -r '.output'
+for COMPOSE_FILE in "$@"; do
+    if [ ! -f "$COMPOSE_FILE" ]; then
+        echo "Error: File '$COMPOSE_FILE' not found"
+        exit 1
+    fi
+done
+
+# Upper bound on conversions running at the same time
+MAX_JOBS=${MAX_JOBS:-8}
+
+OUT_DIR=$(mktemp -d)
+trap 'rm -rf "$OUT_DIR"' EXIT
+
+# Start one request per file so the conversions overlap instead of queuing
+i=0
+for COMPOSE_FILE in "$@"; do
+    # Keep at most MAX_JOBS requests in flight
+    while [ "$(jobs -rp | wc -l)" -ge "$MAX_JOBS" ]; do
+        wait -n
+    done
+
+    # Create JSON payload
+    CONTENT=$(cat "$COMPOSE_FILE" | jq -Rs .)
+
+    # Make the API request
+    curl -X POST http://localhost:7001/process \
+      -H "Content-Type: application/json" \
+      -d "{\"input\": $CONTENT}" \
+      -s > "$OUT_DIR/$i.json" &
+    i=$((i + 1))
+done
+
+wait
+
+# Print results in the order the files were given
+i=0
+for COMPOSE_FILE in "$@"; do
+    echo "Converting $COMPOSE_FILE to Docker Swarm stack file..."
+    echo ""
+    jq -r '.output' < "$OUT_DIR/$i.json"
+    echo ""
+    echo "---"
+    i=$((i + 1))
+done
 
-echo ""
-echo "---"
 echo "Conversion complete!"
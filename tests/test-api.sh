@@ -67,6 +67,29 @@ check_health() {
     fi
 }
 
+# Poll an execution until it reaches a terminal state; prints the final execution JSON
+wait_for_execution() {
+    local execution_id="$1"
+    local timeout="${2:-300}"
+    local elapsed=0
+    local execution=""
+
+    while [ "$elapsed" -lt "$timeout" ]; do
+        execution=$(curl -s "$BACKOFFICE_URL/api/executions/$execution_id")
+        case "$(echo "$execution" | jq -r '.status')" in
+            completed|failed|cancelled)
+                echo "$execution"
+                return 0
+                ;;
+        esac
+        sleep 2
+        elapsed=$((elapsed + 2))
+    done
+
+    echo "$execution"
+    return 1
+}
+
 cleanup() {
     log_info "=== Cleanup ==="
 
@@ -384,8 +407,9 @@ response=$(curl -s -w "\n%{http_code}" -X POST "$BACKOFFICE_URL/api/workflows/$T
 http_code=$(echo "$response" | tail -n1)
 body=$(echo "$response" | head -n-1)
 
-if [ "$http_code" -eq 200 ]; then
+if [ "$http_code" -eq 202 ]; then
     execution_id=$(echo "$body" | jq -r '.execution_id')
+    body=$(jq -n --argjson result "$(wait_for_execution "$execution_id" || true)" '{result: $result}')
     workflow_status=$(echo "$body" | jq -r '.result.status')
 
     if [ "$workflow_status" = "completed" ]; then
@@ -557,8 +581,9 @@ response=$(curl -s -w "\n%{http_code}" -X POST "$BACKOFFICE_URL/api/workflows/Co
 http_code=$(echo "$response" | tail -n1)
 body=$(echo "$response" | head -n-1)
 
-if [ "$http_code" -eq 200 ]; then
+if [ "$http_code" -eq 202 ]; then
     execution_id=$(echo "$body" | jq -r '.execution_id')
+    body=$(jq -n --argjson result "$(wait_for_execution "$execution_id" || true)" '{result: $result}')
     workflow_status=$(echo "$body" | jq -r '.result.status')
 
     log_info "  Execution ID: $execution_id"